@@ -0,0 +1,106 @@
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+from chess import ChessSolver, read_problems
+
+MODES = ('first', 'count', 'all')
+
+def solve_problem(task: tuple) -> tuple[int, float, str, bool]:
+    """
+    Called in worker process. Solves one problem. Error of the problem is written as its result,
+    so it does not stop other problems
+    :param task: Tuple with number of the problem, mode and problem (n, l, pieces) as read_problems yields it
+    :return: Number of the problem, elapsed seconds, result as text and True if the problem raised an error
+    """
+    index, mode, problem = task
+    start = time.perf_counter()
+    try:
+        result = _solve(mode, *problem)
+    except Exception as error:
+        return index, time.perf_counter() - start, f"error: {type(error).__name__}: {error}\n", True
+    return index, time.perf_counter() - start, result, False
+
+def _solve(mode: str, n: int, l: int, pieces: list[tuple[int, int], ]) -> str:
+    """
+    :param mode: One of MODES
+    :param n: Size of the board
+    :param l: Amount of pieces that needs to be placed
+    :param pieces: Coordinates of already placed pieces
+    :return: Result as text
+    """
+    chess = ChessSolver(n)
+    chess.place_pieces(pieces)
+    if mode == 'count':
+        result = str(chess.count(l)) + '\n'
+    elif mode == 'first':
+        solutions = chess.first_solutions(l)
+        result = "".join(str(piece) + " " for piece in solutions[0]) + '\n' if solutions else 'no solutions\n'
+    else:
+        labels = [str(divmod(sq, n)) + " " for sq in range(n * n)]
+        lines = ["".join([labels[x * n + y] for x, y in solution]) + '\n'
+                 for solution in chess.iter_solutions(l, engine='bitboard')]
+        result = "".join(lines) if lines else 'no solutions\n'
+    return result
+
+def run_batch(problems, out, mode: str = 'first', processes: int = 1, chunksize: int = 16) -> int:
+    """
+    Solves problems in worker processes and writes results to out in the order of problems.
+    Result of every problem follows the line "problem <number>: <seconds> s".
+    Problem, that raised an error, has the line "error: <type>: <message>" as its result
+    :param problems: Iterable of (n, l, pieces)
+    :param out: Opened text file
+    :param mode: 'first' - first solution, 'count' - amount of solutions, 'all' - all solutions
+    :param processes: Amount of worker processes. 1 - problems are solved in this process
+    :param chunksize: Amount of problems, that are sent to a worker at once
+    :return: Amount of solved problems, problems with errors are not counted
+    """
+    if mode not in MODES:
+        raise ValueError("Unknown mode: " + str(mode))
+    tasks = ((i, mode, problem) for i, problem in enumerate(problems, 1))
+    solved = 0
+
+    def write(results):
+        nonlocal solved
+        for index, elapsed, result, failed in results:
+            out.write(f"problem {index}: {elapsed:.6f} s\n" + result)
+            solved += not failed
+
+    if processes == 1:
+        write(map(solve_problem, tasks))
+    else:
+        # small problems are sent in chunks, otherwise sending them costs more than solving
+        with Pool(processes) as pool:
+            write(pool.imap(solve_problem, tasks, chunksize))
+    return solved
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Command-line entry point
+    :param argv: Arguments without name of the program. None - sys.argv is used
+    :return: Exit code
+    """
+    parser = argparse.ArgumentParser(description="Solves many chess problems, written one after another "
+                                                 "in the same format as input.txt")
+    parser.add_argument('input', nargs='?', default='-', help="file with problems, '-' - standard input")
+    parser.add_argument('-o', '--output', default='-', help="file for results, '-' - standard output")
+    parser.add_argument('-m', '--mode', choices=MODES, default='first')
+    parser.add_argument('-p', '--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('-c', '--chunksize', type=int, default=16)
+    args = parser.parse_args(argv)
+    f = sys.stdin if args.input == '-' else open(args.input, 'r')
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        start = time.perf_counter()
+        solved = run_batch(read_problems(f), out, args.mode, args.processes, args.chunksize)
+        print(f"{solved} problems solved in {time.perf_counter() - start:.3f} s", file=sys.stderr)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
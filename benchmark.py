@@ -0,0 +1,189 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from itertools import product
+from chess import ChessSolver
+
+MODES = ('list', 'bitboard', 'symmetry', 'first', 'count')
+MOVE_SETS = {
+    'default': None, # moves of ChessSolver
+    'knight': ((1, 2), (2, 1), (-1, 2), (-2, 1), (1, -2), (2, -1), (-1, -2), (-2, -1)),
+    'king': ((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1))
+}
+PLACEMENTS = {
+    'empty': lambda n: [],
+    'center': lambda n: [(n // 2, n // 2)],
+    'corners': lambda n: [(0, 0), (n - 1, n - 1)]
+}
+SIZES = (4, 5, 6)
+AMOUNTS = (2, 4, 6)
+THRESHOLD = 0.1 # relative slowdown, that is reported as regression
+MIN_SECONDS = 0.005 # shorter measurements are too noisy to be compared
+
+def cases(sizes=SIZES, amounts=AMOUNTS, placements=tuple(PLACEMENTS), move_sets=tuple(MOVE_SETS)) -> list[tuple]:
+    """
+    :param sizes: Sizes of the board
+    :param amounts: Amounts of pieces that need to be placed
+    :param placements: Names of already placed pieces from PLACEMENTS
+    :param move_sets: Names of moves from MOVE_SETS
+    :return: List of (name, size, amount, already placed pieces, moves) for every combination
+    """
+    result = []
+    for moves, placement, n, l in product(move_sets, placements, sizes, amounts):
+        pieces = PLACEMENTS[placement](n)
+        result.append((f"{moves}/{placement}/n{n}/l{l}", n, l, pieces, MOVE_SETS[moves]))
+    return result
+
+def _run(mode: str, n: int, l: int, pieces: list[tuple[int, int], ], moves, stats: bool = False) -> dict:
+    """
+    Solves the problem once
+    :param mode: One of MODES
+    :param n: Size of the board
+    :param l: Amount of pieces that needs to be placed
+    :param pieces: Already placed pieces
+    :param moves: Moves of a piece, None - default moves
+    :param stats: if True, statistics of the search are collected
+    :return: Dictionary with seconds, time to first solution, amount of solutions and statistics of the search
+    """
+    chess = ChessSolver(n, _moves=moves)
+    chess.place_pieces(pieces)
+    if stats:
+        chess.enable_stats()
+    first = None
+    solutions = 0
+    start = time.perf_counter()
+    if mode == 'count':
+        solutions = chess.count(l)
+    elif mode == 'first':
+        solutions = len(chess.first_solutions(l))
+        first = time.perf_counter() - start if solutions else None
+    else:
+        if mode == 'list':
+            iterator = chess.iter_solutions(l, engine='list')
+        else:
+            iterator = chess.iter_solutions(l, symmetry=mode == 'symmetry')
+        for _ in iterator:
+            if first is None:
+                first = time.perf_counter() - start
+            solutions += 1
+    return {'seconds': time.perf_counter() - start, 'first_solution_seconds': first, 'solutions': solutions,
+            'stats': None if chess.stats is None or mode in ('symmetry', 'count') else chess.stats.as_dict()}
+
+def measure(mode: str, n: int, l: int, pieces: list[tuple[int, int], ], moves=None, repeat: int = 3) -> dict:
+    """
+    Measures one solver mode on one problem. Times are the best of repeat runs, peak memory and statistics
+    of the search are measured in a separate run, because tracing allocations and counting slow the solver down.
+    :param mode: One of MODES
+    :param n: Size of the board
+    :param l: Amount of pieces that needs to be placed
+    :param pieces: Already placed pieces
+    :param moves: Moves of a piece, None - default moves
+    :param repeat: Amount of timed runs
+    :return: Dictionary with metrics. nodes are None for modes, that do not collect statistics
+    """
+    if mode not in MODES:
+        raise ValueError("Unknown mode: " + str(mode))
+    runs = [_run(mode, n, l, pieces, moves) for _ in range(repeat)]
+    best = min(runs, key=lambda run: run['seconds'])
+    firsts = [run['first_solution_seconds'] for run in runs if run['first_solution_seconds'] is not None]
+    tracemalloc.start()
+    try:
+        stats = _run(mode, n, l, pieces, moves, True)['stats']
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    seconds = max(best['seconds'], 1e-9)
+    nodes = None if stats is None else stats['visited']
+    return {
+        'seconds': best['seconds'],
+        'first_solution_seconds': min(firsts) if firsts else None,
+        'solutions': best['solutions'],
+        'nodes': nodes,
+        'nodes_per_second': None if nodes is None else nodes / seconds,
+        'backtracks': None if stats is None else stats['backtracks'],
+        'prunes': None if stats is None else stats['prunes'],
+        'solutions_per_second': best['solutions'] / seconds,
+        'peak_memory': peak
+    }
+
+def run_suite(suite: list[tuple], modes=MODES, repeat: int = 3, log=None) -> dict:
+    """
+    Measures every mode on every case
+    :param suite: Cases as cases() returns them
+    :param modes: Measured modes
+    :param repeat: Amount of timed runs of every measurement
+    :param log: Opened text file for progress lines, None - nothing is written
+    :return: Dictionary, that can be saved as JSON baseline
+    """
+    results = {}
+    for name, n, l, pieces, moves in suite:
+        results[name] = {}
+        for mode in modes:
+            results[name][mode] = measure(mode, n, l, pieces, moves, repeat)
+            if log is not None:
+                metrics = results[name][mode]
+                log.write(f"{name:28} {mode:9} {metrics['seconds']:10.5f} s {metrics['solutions']:10} solutions "
+                          f"{metrics['peak_memory'] / 1024:10.1f} KiB\n")
+    return {'python': sys.version, 'machine': platform.machine(), 'results': results}
+
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD, min_seconds: float = MIN_SECONDS) -> list[str]:
+    """
+    Compares run with baseline. Only cases and modes, that are in both, are compared.
+    :param current: Result of run_suite
+    :param baseline: Result of run_suite, loaded from JSON
+    :param threshold: Relative growth of time or peak memory, that is reported
+    :param min_seconds: Times shorter than that in baseline are not compared
+    :return: List of descriptions of regressions
+    """
+    regressions = []
+    for name, modes in current['results'].items():
+        for mode, metrics in modes.items():
+            base = baseline['results'].get(name, {}).get(mode)
+            if base is None:
+                continue
+            if metrics['solutions'] != base['solutions']:
+                regressions.append(f"{name} {mode}: {metrics['solutions']} solutions instead of {base['solutions']}")
+            for key in ('seconds', 'first_solution_seconds', 'peak_memory'):
+                old, new = base[key], metrics[key]
+                if old is None or new is None or (key != 'peak_memory' and old < min_seconds):
+                    continue
+                if new > old * (1 + threshold):
+                    regressions.append(f"{name} {mode}: {key} {old:.6g} -> {new:.6g} (+{(new / old - 1) * 100:.1f}%)")
+    return regressions
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Command-line entry point
+    :param argv: Arguments without name of the program. None - sys.argv is used
+    :return: Exit code, 1 if regressions were found
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks ChessSolver and compares results with baseline")
+    parser.add_argument('--save', help="JSON file, where results are saved as new baseline")
+    parser.add_argument('--compare', help="JSON file with baseline")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--amounts', nargs='+', type=int, default=AMOUNTS)
+    parser.add_argument('--placements', nargs='+', choices=tuple(PLACEMENTS), default=tuple(PLACEMENTS))
+    parser.add_argument('--moves', nargs='+', choices=tuple(MOVE_SETS), default=tuple(MOVE_SETS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    suite = cases(args.sizes, args.amounts, args.placements, args.moves)
+    current = run_suite(suite, args.modes, args.repeat, sys.stdout)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=1)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(current, json.load(f), args.threshold)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
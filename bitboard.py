@@ -0,0 +1,584 @@
+from stats import SearchStats
+from rays import split_rays
+from sparse_board import board_shape
+
+STRIP_ROWS = 2 # height of the strips, into which the board is cut to estimate its capacity
+STRIP_COLUMNS = 10 # strips of wider boards are cut into blocks, so the amount of remembered blocks stays small
+ORDERS = ('row', 'fewest_removed') # orders of squares in the search of first solutions
+PROGRESS_NODES = 1 << 14 # amount of visited squares between two calls of progress
+TICK_NODES = 1 << 6 # amount of visited squares, after which resumable search gives control back
+
+class SearchState:
+    def __init__(self, free: int, amount: int):
+        """
+        Initializing class that keeps the stack of the search of first solutions, so it can be continued later.
+        It consists of integers and tuples only, so it can be pickled
+        :param free: Mask of squares, where pieces can be placed
+        :param amount: Amount of pieces that needs to be placed
+        """
+        self.amount = amount
+        self.stack = [(free, amount, 0, -1)] # free squares, pieces left, amount of chosen squares, square to choose
+        self.chosen = []
+        self.nodes = 0 # visited squares
+        self.found = 0 # found solutions
+
+    @property
+    def finished(self) -> bool:
+        """
+        :return: True if the whole search tree was visited
+        """
+        return not self.stack
+
+class EnumerationState:
+    def __init__(self, free: int, amount: int, prefix: tuple[int, ...] = ()):
+        """
+        Initializing class that keeps the stack of the lexicographic search of all solutions, so it can be continued
+        later or in another process. It consists of integers only, so it can be saved as JSON
+        :param free: Mask of squares, where pieces following prefix can be placed
+        :param amount: Amount of pieces that needs to be placed, including prefix
+        :param prefix: Increasing numbers of squares of already chosen first pieces. Only solutions starting with them
+        are searched
+        """
+        self.amount = amount
+        self.prefix = tuple(prefix)
+        self.placed = list(prefix)
+        self.stack = [free] # stack[d] - squares still available for the piece number len(prefix) + d
+        self.nodes = 0 # visited squares
+        self.found = 0 # found solutions
+
+    @property
+    def finished(self) -> bool:
+        """
+        :return: True if the whole search tree was visited
+        """
+        return not self.stack
+
+    def as_dict(self) -> dict:
+        """
+        :return: State as dictionary, that can be saved as JSON
+        """
+        return {'amount': self.amount, 'prefix': list(self.prefix), 'placed': list(self.placed),
+                'stack': list(self.stack), 'nodes': self.nodes, 'found': self.found}
+
+    @staticmethod
+    def from_dict(data: dict):
+        """
+        :param data: Result of as_dict
+        :return: Instance of EnumerationState
+        """
+        state = EnumerationState(0, data['amount'], data['prefix'])
+        state.placed = list(data['placed'])
+        state.stack = list(data['stack'])
+        state.nodes = data['nodes']
+        state.found = data['found']
+        return state
+
+class BitBoard:
+    def __init__(self, dimensions, moves: tuple[tuple[int, int], ...]):
+        """
+        Initializing class that stores the board as bitmasks. Square (x, y) is the bit number x * columns + y,
+        so increasing bit numbers follow the same row-major order as ChessSolver's search.
+        :param dimensions: Size of the board or tuple (rows, columns)
+        :param moves: Moves of a piece
+        """
+        self.dimensions = dimensions
+        self.rows, self.columns = board_shape(dimensions)
+        self.size = self.rows * self.columns # amount of squares
+        self.full = (1 << self.size) - 1
+        leapers, self.directions = split_rays(moves, dimensions)
+        # rays[i][sq] - mask of squares on the ray of directions[i] from sq, sq itself is not included
+        self.rays = [self.__ray_masks(dx, dy) for dx, dy in self.directions]
+        self.attacks = self.__masks(leapers, self.rays) # attacks[sq] - mask of squares attacked by a piece standing on sq
+        self.keep = [self.full ^ mask for mask in self.attacks] # squares that stay free after placing a piece on sq
+        # attackers[sq] - squares, from which a piece attacks sq
+        attackers = self.__masks([(-dx, -dy) for dx, dy in leapers],
+                                 [self.__ray_masks(-dx, -dy) for dx, dy in self.directions])
+        # conflicts[sq] - squares, that can not hold a piece together with sq, whichever of them is placed first
+        self.conflicts = [mask >> (sq + 1) << (sq + 1) | attackers[sq] & (1 << sq) - 1
+                          for sq, mask in enumerate(self.attacks)]
+        self.__strip_width = STRIP_ROWS * self.columns
+        self.__strip = (1 << self.__strip_width) - 1
+        # blocks of STRIP_ROWS rows and block_columns columns differ only by the shift, so free squares
+        # of any block are looked up as squares of the first one: square (x, y) of the block is bit x * columns + y
+        self.__block_columns = columns = min(self.columns, STRIP_COLUMNS)
+        self.__strip_keep = []
+        for x in range(STRIP_ROWS):
+            for y in range(columns):
+                mask = (1 << STRIP_ROWS * columns) - 1
+                for dx, dy in moves:
+                    if 0 <= x + dx < STRIP_ROWS and 0 <= y + dy < columns:
+                        mask &= ~(1 << (x + dx) * columns + y + dy)
+                self.__strip_keep.append(mask)
+        self.__capacities = {0: 0} # free squares of a strip: the largest amount of pieces, that can be placed there
+
+    def __masks(self, leapers, rays: list[list[int]]) -> list[int]:
+        """
+        :param leapers: Moves, that are not parts of rays
+        :param rays: Masks of rays for every square
+        :return: List with mask of squares reached by moves and rays for every square
+        """
+        rows, n = self.rows, self.columns
+        masks = []
+        for x in range(rows):
+            for y in range(n):
+                mask = 0
+                for dx, dy in leapers:
+                    if 0 <= x + dx < rows and 0 <= y + dy < n:
+                        mask |= 1 << ((x + dx) * n + y + dy)
+                masks.append(mask)
+        for ray in rays:
+            masks = [mask | ray_mask for mask, ray_mask in zip(masks, ray)]
+        return masks
+
+    def __ray_masks(self, dx: int, dy: int) -> list[int]:
+        """
+        Builds masks of the ray for every square. The ray of a square is its first step
+        together with the ray of the square of the first step
+        :param dx: Step of the ray along X
+        :param dy: Step of the ray along Y
+        :return: List with mask of the ray for every square
+        """
+        rows, n = self.rows, self.columns
+        masks = [0] * self.size
+        step = dx * n + dy
+        squares = range(self.size - 1, -1, -1) if step > 0 else range(self.size) # the first step is built before sq
+        for sq in squares:
+            x, y = divmod(sq, n)
+            if 0 <= x + dx < rows and 0 <= y + dy < n:
+                masks[sq] = 1 << sq + step | masks[sq + step]
+        return masks
+
+    def square(self, x: int, y: int) -> int:
+        """
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: Number of the bit of the square
+        """
+        return x * self.columns + y
+
+    def coordinates(self, sq: int) -> tuple[int, int]:
+        """
+        :param sq: Number of the bit of the square
+        :return: Tuple with x and y coordinates of the square
+        """
+        return divmod(sq, self.columns)
+
+    def free_squares(self, board: list[list[int]], pieces=()) -> int:
+        """
+        Converts two-dimensional list into mask of squares, that are neither occupied nor attacked
+        :param board: Two-dimensional list
+        :param pieces: Coordinates of placed pieces. Their squares are not free, even if attacks of pieces
+        with asymmetric moves made them 0
+        :return: Mask of free squares
+        """
+        free = 0
+        for x, row in enumerate(board):
+            for y, value in enumerate(row):
+                if value == 0:
+                    free |= 1 << (x * self.columns + y)
+        for x, y in pieces:
+            free &= ~(1 << (x * self.columns + y))
+        return free
+
+    def after(self, free: int, squares: tuple[int, ...]) -> int:
+        """
+        Mask of squares still available to the search after pieces were placed on squares in increasing order
+        :param free: Mask of free squares before placing
+        :param squares: Increasing numbers of squares of placed pieces
+        :return: Mask of free squares, that follow the last placed piece
+        """
+        for sq in squares:
+            free &= self.keep[sq]
+        if squares:
+            free = free >> (squares[-1] + 1) << (squares[-1] + 1)
+        return free
+
+    def __strip_capacity(self, free: int) -> int:
+        """
+        Finds the largest amount of pieces, that can be placed on free squares of the first strip
+        :param free: Mask of free squares of the strip
+        :return: Amount of pieces
+        """
+        capacity = self.__capacities.get(free)
+        if capacity is None:
+            low = free & -free
+            rest = free ^ low
+            capacity = max(self.__strip_capacity(rest),
+                           1 + self.__strip_capacity(rest & self.__strip_keep[low.bit_length() - 1]))
+            self.__capacities[free] = capacity
+        return capacity
+
+    def capacity(self, free: int) -> int:
+        """
+        Upper bound of amount of pieces, that can be placed on free squares.
+        The board is cut into strips of STRIP_ROWS rows and the largest amounts for every strip are summed up.
+        :param free: Mask of free squares
+        :return: Amount of pieces
+        """
+        if self.__block_columns < self.columns:
+            return self.__blocks_capacity(free)
+        width = self.__strip_width
+        strip = self.__strip
+        capacities = self.__capacities
+        free >>= ((free & -free).bit_length() - 1) // width * width if free else 0
+        total = 0
+        while free:
+            part = free & strip
+            capacity = capacities.get(part)
+            total += self.__strip_capacity(part) if capacity is None else capacity
+            free >>= width
+        return total
+
+    def __blocks_capacity(self, free: int) -> int:
+        """
+        capacity of the board wider than STRIP_COLUMNS. Strips are cut into blocks of STRIP_COLUMNS columns
+        :param free: Mask of free squares
+        :return: Amount of pieces
+        """
+        n = self.columns
+        columns = self.__block_columns
+        row = (1 << n) - 1
+        block_row = (1 << columns) - 1
+        capacities = self.__capacities
+        free >>= ((free & -free).bit_length() - 1) // self.__strip_width * self.__strip_width if free else 0
+        total = 0
+        while free:
+            rows = [free >> x * n & row for x in range(STRIP_ROWS)]
+            for y in range(0, n, columns):
+                part = 0
+                for x, bits in enumerate(rows):
+                    part |= (bits >> y & block_row) << x * columns
+                capacity = capacities.get(part)
+                total += self.__strip_capacity(part) if capacity is None else capacity
+            free >>= self.__strip_width
+        return total
+
+    def solutions(self, free: int, amount: int, progress=None, stats: SearchStats | None = None):
+        """
+        Yields all placements of pieces on free squares. Placements are yielded in lexicographic order
+        of square numbers, the same order ChessSolver's recursive algorithm writes them in.
+        A branch is cut, when the capacity of the squares left is less than amount of pieces left.
+        :param free: Mask of squares, where pieces can be placed
+        :param amount: Amount of pieces that needs to be placed
+        :param progress: Function, that is called with amounts of visited squares and found solutions
+        every PROGRESS_NODES visited squares. It can stop the search by raising an exception
+        :param stats: if given, statistics of the search are collected there
+        :return: Generator of tuples with numbers of squares of placed pieces
+        """
+        if progress is not None or stats is not None:
+            yield from self.__solutions_with_stats(free, amount, progress,
+                                                   SearchStats(every=PROGRESS_NODES) if stats is None else stats)
+            return
+        if amount == 0:
+            yield ()
+            return
+        if self.capacity(free) < amount:
+            return
+        keep = self.keep
+        capacity = self.capacity
+        placed = []
+        stack = [free] # stack[d] - squares still available for the piece number d
+        while stack:
+            avail = stack[-1]
+            left = amount - len(stack) # pieces left after placing the piece number d
+            if not left: # every available square completes a solution
+                while avail:
+                    low = avail & -avail
+                    avail ^= low
+                    yield (*placed, low.bit_length() - 1)
+            if avail.bit_count() <= left:
+                stack.pop()
+                if placed:
+                    placed.pop()
+                continue
+            low = avail & -avail
+            avail ^= low
+            stack[-1] = avail
+            sq = low.bit_length() - 1
+            following = avail & keep[sq]
+            if following.bit_count() < left or left > 1 and capacity(following) < left:
+                continue
+            placed.append(sq)
+            stack.append(following)
+
+    def __solutions_with_stats(self, free: int, amount: int, progress, stats: SearchStats):
+        """
+        The same search as solutions, that also collects statistics and reports progress.
+        It is kept apart, so the search without statistics does not pay for counting.
+        :param free: Mask of squares, where pieces can be placed
+        :param amount: Amount of pieces that needs to be placed
+        :param progress: Function, that is called with amounts of visited squares and found solutions
+        :param stats: Statistics of the search
+        :return: Generator of tuples with numbers of squares of placed pieces
+        """
+        keep = self.keep
+        capacity = self.capacity
+        nodes = stats.nodes = [0] * amount
+        visited = backtracks = prunes = leaves = 0
+        report = stats.every
+        placed = []
+        stack = [free] if amount else []
+        if not amount:
+            stats.leaves = leaves = 1
+            stats.first_solution_seconds = stats.elapsed()
+            yield ()
+        elif capacity(free) < amount:
+            prunes = 1
+            stack = []
+        try:
+            while stack:
+                avail = stack[-1]
+                depth = len(stack) - 1
+                left = amount - len(stack)
+                if not left:
+                    count = avail.bit_count()
+                    nodes[depth] += count
+                    visited += count
+                    while avail:
+                        low = avail & -avail
+                        avail ^= low
+                        if not leaves:
+                            stats.first_solution_seconds = stats.elapsed()
+                        leaves += 1
+                        yield (*placed, low.bit_length() - 1)
+                if visited >= report:
+                    stats.visited, stats.backtracks, stats.prunes, stats.leaves = visited, backtracks, prunes, leaves
+                    stats.report(progress)
+                    report = visited + stats.every
+                if avail.bit_count() <= left:
+                    stack.pop()
+                    if placed:
+                        placed.pop()
+                        backtracks += 1
+                    continue
+                low = avail & -avail
+                avail ^= low
+                stack[-1] = avail
+                sq = low.bit_length() - 1
+                nodes[depth] += 1
+                visited += 1
+                following = avail & keep[sq]
+                if following.bit_count() < left or left > 1 and capacity(following) < left:
+                    prunes += 1
+                    continue
+                placed.append(sq)
+                stack.append(following)
+        finally: # counters are kept, even if the caller stops iterating
+            stats.visited, stats.backtracks, stats.prunes, stats.leaves = visited, backtracks, prunes, leaves
+        stats.report(progress)
+
+    def shards(self, free: int, amount: int, depth: int = 1) -> list[tuple[int, ...]]:
+        """
+        Splits the search tree of solutions by first placed pieces. Shards are numbered in lexicographic order,
+        so solutions of shards taken one after another are in the same order as solutions yields them.
+        Shards, in which the rest of pieces does not fit, are dropped
+        :param free: Mask of free squares
+        :param amount: Amount of pieces that needs to be placed
+        :param depth: Amount of first placed pieces, that define a shard, it is not greater than amount
+        :return: List of prefixes of shards, tuples with increasing numbers of squares
+        """
+        depth = min(depth, amount)
+        return [prefix for prefix in self.solutions(free, depth)
+                if self.capacity(self.after(free, prefix)) >= amount - depth]
+
+    def resume_solutions(self, state: EnumerationState, tick: int = TICK_NODES, first_tick: int | None = None):
+        """
+        The same search as solutions, that keeps its stack in state. Every tick visited squares it yields None,
+        at that moment and after every solution state is complete, so the caller can stop iterating
+        and continue the search later with the same state
+        :param state: State of the search, created for the same board
+        :param tick: Amount of visited squares between two yields of None
+        :param first_tick: Amount of visited squares before the first yield of None, so ticks of many small
+        searches can follow each other. None - tick
+        :return: Generator of tuples with numbers of squares of placed pieces in lexicographic order and None
+        """
+        keep = self.keep
+        capacity = self.capacity
+        stack = state.stack
+        placed = state.placed
+        amount = state.amount
+        nodes = state.nodes
+        next_tick = nodes + (tick if first_tick is None else first_tick)
+        if stack and len(placed) == amount: # prefix is the whole solution
+            stack.pop()
+            state.found += 1
+            yield tuple(placed)
+        while stack:
+            if nodes >= next_tick:
+                state.nodes = nodes
+                yield None
+                next_tick = nodes + tick
+            avail = stack[-1]
+            left = amount - len(placed) - 1 # pieces left after placing the next one
+            if not left:
+                while avail:
+                    low = avail & -avail
+                    avail ^= low
+                    stack[-1] = avail
+                    nodes += 1
+                    state.nodes = nodes
+                    state.found += 1
+                    yield (*placed, low.bit_length() - 1)
+            if avail.bit_count() <= left:
+                stack.pop()
+                if stack:
+                    placed.pop()
+                continue
+            low = avail & -avail
+            avail ^= low
+            stack[-1] = avail
+            sq = low.bit_length() - 1
+            nodes += 1
+            following = avail & keep[sq]
+            if following.bit_count() < left or left > 1 and capacity(following) < left:
+                continue
+            placed.append(sq)
+            stack.append(following)
+        state.nodes = nodes
+
+    def first_solutions(self, free: int, amount: int, order: str = 'row', progress=None,
+                        stats: SearchStats | None = None):
+        """
+        Yields different placements of pieces on free squares in the order they are found.
+        Every step takes one square, tries to place a piece there and then to leave it empty,
+        so the search backtracks instead of committing to the first choice.
+        :param free: Mask of squares, where pieces can be placed
+        :param amount: Amount of pieces that needs to be placed
+        :param order: 'row' - squares are taken in row-major order,
+        'fewest_removed' - the square, a piece on which removes the fewest free squares, is taken first
+        :param progress: Function, that is called with amounts of visited squares and found solutions
+        every PROGRESS_NODES visited squares. It can stop the search by raising an exception
+        :param stats: if given, statistics of the search are collected there
+        :return: Generator of tuples with increasing numbers of squares of placed pieces
+        """
+        if progress is not None or stats is not None:
+            yield from self.__first_solutions_with_stats(free, amount, order, progress,
+                                                         SearchStats(every=PROGRESS_NODES) if stats is None else stats)
+            return
+        conflicts = self.conflicts
+        capacity = self.capacity
+        chosen = []
+        stack = [(free, amount, 0, -1)] # free squares, pieces left, amount of chosen squares, square to choose
+        while stack:
+            free, left, depth, sq = stack.pop()
+            del chosen[depth:]
+            if sq >= 0:
+                chosen.append(sq)
+                depth += 1
+            if not left:
+                yield tuple(sorted(chosen))
+                continue
+            if free.bit_count() < left or left > 1 and capacity(free) < left:
+                continue
+            sq = self.__next_square(free, order)
+            free ^= 1 << sq
+            stack.append((free, left, depth, -1)) # square stays empty, tried second
+            stack.append((free & ~conflicts[sq], left - 1, depth, sq))
+
+    def __first_solutions_with_stats(self, free: int, amount: int, order: str, progress, stats: SearchStats):
+        """
+        The same search as first_solutions, that also collects statistics and reports progress.
+        :param free: Mask of squares, where pieces can be placed
+        :param amount: Amount of pieces that needs to be placed
+        :param order: Order of squares
+        :param progress: Function, that is called with amounts of visited squares and found solutions
+        :param stats: Statistics of the search
+        :return: Generator of tuples with increasing numbers of squares of placed pieces
+        """
+        conflicts = self.conflicts
+        capacity = self.capacity
+        nodes = stats.nodes = [0] * amount
+        visited = backtracks = prunes = leaves = 0
+        report = stats.every
+        chosen = []
+        stack = [(free, amount, 0, -2)] # -2 - root, -1 - square left empty after a piece was tried there
+        try:
+            while stack:
+                free, left, depth, sq = stack.pop()
+                del chosen[depth:]
+                if sq >= 0:
+                    chosen.append(sq)
+                    nodes[depth] += 1
+                    visited += 1
+                    depth += 1
+                elif sq == -1:
+                    backtracks += 1
+                if visited >= report:
+                    stats.visited, stats.backtracks, stats.prunes, stats.leaves = visited, backtracks, prunes, leaves
+                    stats.report(progress)
+                    report = visited + stats.every
+                if not left:
+                    if not leaves:
+                        stats.first_solution_seconds = stats.elapsed()
+                    leaves += 1
+                    yield tuple(sorted(chosen))
+                    continue
+                if free.bit_count() < left or left > 1 and capacity(free) < left:
+                    prunes += 1
+                    continue
+                sq = self.__next_square(free, order)
+                free ^= 1 << sq
+                stack.append((free, left, depth, -1))
+                stack.append((free & ~conflicts[sq], left - 1, depth, sq))
+        finally: # counters are kept, even if the caller stops iterating
+            stats.visited, stats.backtracks, stats.prunes, stats.leaves = visited, backtracks, prunes, leaves
+        stats.report(progress)
+
+    def resume_first_solutions(self, state: SearchState, order: str = 'row', tick: int = TICK_NODES):
+        """
+        The same search as first_solutions, that keeps its stack in state. Every tick visited squares it yields None,
+        at that moment and after every solution state is complete, so the caller can stop iterating
+        and continue the search later with the same state
+        :param state: State of the search, created for the same board
+        :param order: Order of squares
+        :param tick: Amount of visited squares between two yields of None
+        :return: Generator of tuples with increasing numbers of squares of placed pieces and None
+        """
+        conflicts = self.conflicts
+        capacity = self.capacity
+        stack = state.stack
+        chosen = state.chosen
+        nodes = state.nodes
+        next_tick = nodes + tick
+        while stack:
+            if nodes >= next_tick:
+                state.nodes = nodes
+                yield None
+                next_tick = nodes + tick
+            free, left, depth, sq = stack.pop()
+            del chosen[depth:]
+            if sq >= 0:
+                chosen.append(sq)
+                depth += 1
+            nodes += 1
+            if not left:
+                state.nodes = nodes
+                state.found += 1
+                yield tuple(sorted(chosen))
+                continue
+            if free.bit_count() < left or left > 1 and capacity(free) < left:
+                continue
+            sq = self.__next_square(free, order)
+            free ^= 1 << sq
+            stack.append((free, left, depth, -1))
+            stack.append((free & ~conflicts[sq], left - 1, depth, sq))
+        state.nodes = nodes
+
+    def __next_square(self, free: int, order: str) -> int:
+        """
+        :param free: Mask of free squares, not empty
+        :param order: 'row' - the first free square, 'fewest_removed' - the square, a piece on which
+        removes the fewest free squares
+        :return: Number of the square, that is tried next
+        """
+        if order == 'row':
+            return (free & -free).bit_length() - 1
+        conflicts = self.conflicts
+        low, removed, rest = 0, -1, free
+        while rest:
+            bit = rest & -rest
+            rest ^= bit
+            count = (conflicts[bit.bit_length() - 1] & free).bit_count()
+            if removed < 0 or count < removed:
+                low, removed = bit, count
+        return low.bit_length() - 1
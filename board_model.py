@@ -0,0 +1,141 @@
+from collections import Counter
+from chess import ChessSolver
+
+# States of squares
+FREE = 0
+PIECE = 1
+PIECE_AUTO = 2
+ATTACKED = 3
+
+class BoardModel:
+    def __init__(self, chess: ChessSolver):
+        """
+        Initializing class that keeps states of squares for views of the board. Pieces placed by user are placed
+        on chess too, so the solver and all views share one board. Every change is sent to listeners as list
+        of squares, which states flipped, so views repaint only them
+        :param chess: Instance of ChessSolver, it is changed only through the model
+        """
+        self.chess = chess
+        self.pieces = set(chess.pieces) # pieces placed by user
+        self.auto_pieces = {} # pieces of the shown solution: squares they attack
+        self.attacks = Counter() # square: amount of pieces attacking it
+        for x, y in chess.pieces:
+            self.attacks.update(chess.attacked_squares(x, y))
+        self.__listeners = []
+
+    def subscribe(self, listener) -> None:
+        """
+        :param listener: Function, that is called with list of ((x, y), state) of changed squares
+        :return: None
+        """
+        self.__listeners.append(listener)
+
+    def unsubscribe(self, listener) -> None:
+        """
+        :param listener: Function given to subscribe
+        :return: None
+        """
+        if listener in self.__listeners:
+            self.__listeners.remove(listener)
+
+    def state(self, square: tuple[int, int]) -> int:
+        """
+        :param square: Coordinates of the square
+        :return: FREE, PIECE, PIECE_AUTO or ATTACKED
+        """
+        if square in self.pieces:
+            return PIECE
+        if square in self.auto_pieces:
+            return PIECE_AUTO
+        if self.attacks[square]:
+            return ATTACKED
+        return FREE
+
+    def squares(self) -> list[tuple[tuple[int, int], int]]:
+        """
+        :return: List of ((x, y), state) of all squares, that are not free, to fill a new view
+        """
+        squares = set(self.attacks) | self.pieces | set(self.auto_pieces)
+        return [(square, self.state(square)) for square in squares]
+
+    def __notify(self, squares) -> None:
+        """
+        Sends new states of squares to listeners
+        :param squares: Iterable of coordinates of squares, which states may have changed
+        :return: None
+        """
+        changes = [(square, self.state(square)) for square in squares]
+        for listener in list(self.__listeners):
+            listener(changes)
+
+    def __attack(self, targets: list[tuple[int, int]], action: int) -> list[tuple[int, int]]:
+        """
+        :param targets: Squares attacked by a piece
+        :param action: 1 - piece is placed, -1 - piece is removed
+        :return: Squares, that became attacked or free
+        """
+        attacks = self.attacks
+        flipped = []
+        for square in targets:
+            count = attacks[square] + action
+            if count:
+                attacks[square] = count
+            else:
+                del attacks[square] # only attacked squares are kept
+            if count == (1 if action > 0 else 0): # the first attack came or the last one left
+                flipped.append(square)
+        return flipped
+
+    def place(self, x: int, y: int) -> bool:
+        """
+        Places piece on free square
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: True if the piece was placed
+        """
+        if self.state((x, y)) != FREE:
+            return False
+        self.pieces.add((x, y))
+        self.__notify([(x, y)] + self.__attack(self.chess.place_piece(x, y), 1))
+        return True
+
+    def remove(self, x: int, y: int) -> bool:
+        """
+        Removes piece placed by user
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: True if the piece was removed
+        """
+        if (x, y) not in self.pieces:
+            return False
+        self.pieces.remove((x, y))
+        self.__notify([(x, y)] + self.__attack(self.chess.delete_piece(x, y), -1))
+        return True
+
+    def show_solution(self, solution: list[tuple[int, int], ]) -> None:
+        """
+        Shows pieces of the solution, that are not placed by user. They are not placed on chess,
+        so the solver keeps only pieces placed by user
+        :param solution: List of coordinates of all pieces of the solution
+        :return: None
+        """
+        self.clear_solution()
+        changed = []
+        for x, y in solution:
+            if (x, y) not in self.pieces:
+                self.auto_pieces[(x, y)] = targets = self.chess.attacked_squares(x, y)
+                changed.append((x, y))
+                changed.extend(self.__attack(targets, 1))
+        self.__notify(changed) # whole solution is one update
+
+    def clear_solution(self) -> None:
+        """
+        Hides pieces of the shown solution
+        :return: None
+        """
+        changed = list(self.auto_pieces)
+        auto_pieces, self.auto_pieces = self.auto_pieces, {}
+        for targets in auto_pieces.values():
+            changed.extend(self.__attack(targets, -1))
+        if changed:
+            self.__notify(changed)
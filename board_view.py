@@ -3,11 +3,14 @@ from PySide6.QtWidgets import (
     QGraphicsScene,
     QGraphicsView,
     QGraphicsRectItem,
+    QGraphicsItem,
+    QStyleOptionGraphicsItem,
     QSizePolicy
 )
-from PySide6.QtGui import QBrush
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QBrush, QPainter
+from PySide6.QtCore import Qt, QRectF
 from functools import partial
+from board_model import FREE, PIECE, PIECE_AUTO, ATTACKED
 
 # Constants
 TILE_SIZE = 25
@@ -16,6 +19,8 @@ TILE_COLOR = QBrush(Qt.green)
 PIECE_COLOR = QBrush(Qt.red)
 PIECE_AUTO_COLOR = QBrush(Qt.blue)
 ATTACKED_TILE_COLOR = QBrush(Qt.black)
+STATE_COLORS = (TILE_COLOR, PIECE_COLOR, PIECE_AUTO_COLOR, ATTACKED_TILE_COLOR)
+TILE_ITEMS_LIMIT = 20 # larger boards are painted by one BoardItem
 
 class Tile(QGraphicsRectItem):
     def __init__(self, x, y, width, height, func):
@@ -46,35 +51,178 @@ class Tile(QGraphicsRectItem):
         self.func()
         super().mousePressEvent(event)
 
-class BoardView(QGraphicsView):
+class BoardItem(QGraphicsItem):
     def __init__(self, size: int, func):
+        """
+        Initializing item, that paints the whole board from array of states of squares.
+        Only squares in the exposed part of the item are painted.
+        :param size: Size of the board
+        :param func: Function that will be called upon clicking square, with x and y coordinates and is_LMB
+        """
+        super().__init__()
+        self.size = size
+        self.func = func
+        self.states = bytearray(size * size) # state of square (x, y) is states[x * size + y]
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption) # exposedRect is filled
+
+    def boundingRect(self) -> QRectF:
+        """
+        :return: Rectangle, that contains all squares
+        """
+        side = self.size * (TILE_SIZE + SPACING) - SPACING
+        return QRectF(0, 0, side, side)
+
+    @staticmethod
+    def square_rect(x: int, y: int) -> QRectF:
+        """
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: Rectangle of the square
+        """
+        return QRectF(y * (TILE_SIZE + SPACING), x * (TILE_SIZE + SPACING), TILE_SIZE, TILE_SIZE)
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None) -> None:
+        """
+        Called by scene. Paints squares, that intersect exposed rectangle.
+        :param painter: Painter of the view
+        :param option: Style options with exposed rectangle
+        :param widget: Widget that is painted on
+        :return: None
+        """
+        step = TILE_SIZE + SPACING
+        exposed = option.exposedRect
+        first_x = max(0, int(exposed.top() // step))
+        last_x = min(self.size - 1, int(exposed.bottom() // step))
+        first_y = max(0, int(exposed.left() // step))
+        last_y = min(self.size - 1, int(exposed.right() // step))
+        painter.setPen(Qt.PenStyle.NoPen)
+        states = self.states
+        for x in range(first_x, last_x + 1):
+            row = x * self.size
+            for y in range(first_y, last_y + 1):
+                painter.fillRect(y * step, x * step, TILE_SIZE, TILE_SIZE, STATE_COLORS[states[row + y]])
+
+    def set_states(self, changes) -> None:
+        """
+        Changes states of squares and repaints only rectangle, that contains changed squares
+        :param changes: Iterable of ((x, y), state)
+        :return: None
+        """
+        first_x = first_y = self.size
+        last_x = last_y = -1
+        for (x, y), state in changes:
+            self.states[x * self.size + y] = state
+            first_x, last_x = min(first_x, x), max(last_x, x)
+            first_y, last_y = min(first_y, y), max(last_y, y)
+        if last_x >= 0:
+            self.update(self.square_rect(first_x, first_y).united(self.square_rect(last_x, last_y)))
+
+    def mousePressEvent(self, event, /):
+        """
+        Called upon clicking on the board. Finds clicked square by coordinates and calls func,
+        if square is not attacked. Clicks on spacing between squares are ignored.
+        :param event: An instance of QGraphicsSceneMouseEvent
+        :return: None
+        """
+        step = TILE_SIZE + SPACING
+        pos = event.pos()
+        x, y = int(pos.y() // step), int(pos.x() // step)
+        event.accept()
+        if not (0 <= x < self.size and 0 <= y < self.size) or pos.y() % step >= TILE_SIZE or pos.x() % step >= TILE_SIZE:
+            return None
+        if self.states[x * self.size + y] == ATTACKED:
+            return None
+        if event.button() == Qt.MouseButton.RightButton:
+            self.func(x, y, False)
+        elif event.button() == Qt.MouseButton.LeftButton:
+            self.func(x, y, True)
+        return None
+
+class BoardView(QGraphicsView):
+    def __init__(self, size: int, func, single_item: bool | None = None):
         """
         Initialization of PySide6's QGraphicsView with board and pieces placed on it.
         :param size: Size of the board
         :param func: Function that will be called upon user clicking a tile. Have to have first two parameters of x and y coordinates
+        :param single_item: if True then board is painted by one BoardItem, otherwise every square is Tile.
+        if None, BoardItem is used for boards larger than TILE_ITEMS_LIMIT
         """
         super().__init__()
         self.size: int = size
         self.func = func
+        self.is_LMB = None # button of the last click
         self.scene: QGraphicsScene = QGraphicsScene(self)
         self.setSizePolicy(
             QSizePolicy.MinimumExpanding,
             QSizePolicy.MinimumExpanding
         )
+        if single_item is None:
+            single_item = size > TILE_ITEMS_LIMIT
         self.board = [] # two-dimensional list, containing instances of class Tile
-        for i in range(size):
-            a = []
-            for j in range(size):
-                func = partial(self.func, i, j)
-                rect = Tile(j*(TILE_SIZE+SPACING), i*(TILE_SIZE+SPACING), TILE_SIZE, TILE_SIZE, func)
-                a.append(rect)
-                self.scene.addItem(rect)
-            self.board.append(a)
+        self.item = None
+        if single_item:
+            self.item = BoardItem(size, self.__item_clicked)
+            self.scene.addItem(self.item)
+        else:
+            for i in range(size):
+                a = []
+                for j in range(size):
+                    func = partial(self.__tile_clicked, i, j)
+                    rect = Tile(j*(TILE_SIZE+SPACING), i*(TILE_SIZE+SPACING), TILE_SIZE, TILE_SIZE, func)
+                    a.append(rect)
+                    self.scene.addItem(rect)
+                self.board.append(a)
         self.setScene(self.scene)
 
+    def __tile_clicked(self, x: int, y: int) -> None:
+        """
+        Called upon clicking tile.
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: None
+        """
+        self.is_LMB = self.board[x][y].is_LMB
+        self.func(x, y)
+
+    def __item_clicked(self, x: int, y: int, is_LMB: bool) -> None:
+        """
+        Called upon clicking square of BoardItem.
+        :param x: X coordinate
+        :param y: Y coordinate
+        :param is_LMB: True if left mouse button was clicked
+        :return: None
+        """
+        self.is_LMB = is_LMB
+        self.func(x, y)
+
+    def set_state(self, x: int, y: int, state: int) -> None:
+        """
+        Changes color of the square. Attacked squares can not be clicked.
+        :param x: X coordinate
+        :param y: Y coordinate
+        :param state: FREE, PIECE, PIECE_AUTO or ATTACKED
+        :return: None
+        """
+        self.set_states((((x, y), state),))
+
+    def set_states(self, changes) -> None:
+        """
+        Changes colors of many squares at once, e.g. whole solution.
+        :param changes: Iterable of ((x, y), state)
+        :return: None
+        """
+        if self.item is not None:
+            self.item.set_states(changes)
+            return None
+        for (x, y), state in changes:
+            tile = self.board[x][y]
+            tile.setBrush(STATE_COLORS[state])
+            tile.setEnabled(state != ATTACKED)
+        return None
+
     def get_board(self) -> list[list[Tile, ], ]:
         """
-        :return: Board
+        :return: Board, empty if board is painted by one BoardItem
         """
         return self.board
 
@@ -0,0 +1,70 @@
+import json
+import os
+import time
+from bitboard import EnumerationState
+
+CHECKPOINT_SECONDS = 60 # seconds between two saves of the checkpoint
+
+def _normalized(problem) -> list:
+    """
+    :param problem: Description of the problem made of numbers, tuples and lists
+    :return: The same description, as it is read back from JSON
+    """
+    return json.loads(json.dumps(problem))
+
+class Checkpoint:
+    def __init__(self, filename: str, every: float = CHECKPOINT_SECONDS):
+        """
+        Initializing class that keeps the state of the enumeration in JSON file, so it can be continued
+        after interruption. The file is replaced at once, so it always holds a whole checkpoint
+        :param filename: Name of the checkpoint file
+        :param every: Seconds between two saves
+        """
+        self.filename = filename
+        self.every = every
+        self.__next_save = time.monotonic() + every
+
+    @property
+    def due(self) -> bool:
+        """
+        :return: True if the checkpoint needs to be saved
+        """
+        return time.monotonic() >= self.__next_save
+
+    def load(self, problem) -> tuple[int, EnumerationState, int] | None:
+        """
+        :param problem: Description of the problem, the same as given to save
+        :return: Tuple with number of the shard, state of its search and size of the output file,
+        or None if there is no checkpoint
+        """
+        if not os.path.exists(self.filename):
+            return None
+        with open(self.filename, 'r') as f:
+            data = json.load(f)
+        if data['problem'] != _normalized(problem):
+            raise ValueError("Checkpoint is saved for another problem")
+        return data['shard'], EnumerationState.from_dict(data['state']), data['offset']
+
+    def save(self, problem, shard: int, state: EnumerationState, offset: int) -> None:
+        """
+        :param problem: Description of the problem made of numbers, tuples and lists
+        :param shard: Number of the shard, that is searched
+        :param state: State of the search of the shard
+        :param offset: Size of the output file, that holds all solutions found before state
+        :return: None
+        """
+        temporary = self.filename + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump({'problem': _normalized(problem), 'shard': shard, 'state': state.as_dict(), 'offset': offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.filename)
+        self.__next_save = time.monotonic() + self.every
+
+    def remove(self) -> None:
+        """
+        Removes the checkpoint, when the enumeration is over
+        :return: None
+        """
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
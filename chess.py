@@ -1,35 +1,143 @@
+import os
+import time
+from itertools import islice
+from bitboard import BitBoard, EnumerationState, ORDERS, PROGRESS_NODES, SearchState
+from checkpoint import Checkpoint
+from parallel import write_parallel
+from counting import count_placements, count_transpositions, ProfileTooLarge, TranspositionTable
+from regions import Regions, components
+from symmetry import Symmetry
+from solution_file import write_binary
+from writer import COMPRESSIONS, SolutionWriter, open_text
+from result_cache import ResultCache
+from stats import SearchStats, HOOK_NODES
+from numpy_board import create_numpy_board, is_numpy_board, place_numpy_pieces, non_attacking
+from rays import ray_moves, split_rays, opposite_missing
+from sparse_board import SparseBoard, SPARSE_SQUARES, board_shape
+
+ENGINES = ('list', 'bitboard')
+FILE_FORMATS = ('text', 'binary')
+COUNT_MODES = ('profile', 'transposition', 'regions')
+DEFAULT_MOVES = (
+    (0, -1), (0, 1), (3, 0), (-3, 0), (0, -3), (0, 3), (-1, -2), (-1, 2), (-1, 0), (1, -2), (1, 2), (1, 0),
+    (-2, -1),
+    (-2, 1), (2, -1), (2, 1))
+
+class _Targets(dict):
+    """
+    Squares attacked by a piece, found once for every square, so placing a piece does not go through moves,
+    that leave the board. Rays are also kept as lists of squares starting from the nearest one
+    """
+    def __init__(self, dimensions, moves: tuple[tuple[int, int], ...]):
+        """
+        :param dimensions: Size of the board or tuple (rows, columns)
+        :param moves: Moves of a piece
+        """
+        super().__init__()
+        self.rows, self.columns = board_shape(dimensions)
+        self.leapers, self.directions = split_rays(moves, dimensions)
+
+    def __missing__(self, key: tuple[int, int]) -> tuple[list, list, list]:
+        x, y = key
+        rows, n = self.rows, self.columns
+        leaps = [(x + dx, y + dy) for dx, dy in self.leapers if 0 <= x + dx < rows and 0 <= y + dy < n]
+        rays = []
+        for dx, dy in self.directions:
+            k = 1
+            while 0 <= x + k * dx < rows and 0 <= y + k * dy < n:
+                k += 1
+            rays.append([(x + i * dx, y + i * dy) for i in range(1, k)])
+        # squares of moves that are not rays, rays, all attacked squares
+        self[key] = targets = (leaps, rays, leaps + [square for ray in rays for square in ray])
+        return targets
+
+class _TimedFile:
+    def __init__(self, f, stats: SearchStats):
+        """
+        Initializing wrapper of the output file, that adds time of writing to statistics
+        :param f: Opened file
+        :param stats: Statistics of the search
+        """
+        self.__f = f
+        self.__stats = stats
+
+    def write(self, data) -> int:
+        """
+        :param data: Written string or bytes
+        :return: Amount of written characters or bytes
+        """
+        start = time.perf_counter()
+        written = self.__f.write(data)
+        self.__stats.write_seconds += time.perf_counter() - start
+        return written
+
+class SolveResult:
+    def __init__(self, solutions: list[tuple], complete: bool, state: SearchState, pieces: tuple, order: str):
+        """
+        Initializing class with the result of ChessSolver.solve
+        :param solutions: Tuples with coordinates of already placed pieces followed by placed ones
+        :param complete: True if the whole search tree was visited, so there are no more solutions
+        :param state: State of the search, that continues it, when the result is given to solve again
+        :param pieces: Coordinates of already placed pieces at the moment of the first call
+        :param order: Order of squares of the search
+        """
+        self.solutions = solutions
+        self.complete = complete
+        self.state = state
+        self.pieces = pieces
+        self.order = order
+
+def read_problems(f):
+    """
+    Reads problems from opened file or stream, one after another. Every problem is a line with n, l and k
+    followed by k lines with coordinates of already placed pieces. Empty lines between problems are skipped.
+    :param f: Opened text file or iterable of lines
+    :return: Generator of tuples (n, l, pieces)
+    """
+    lines = (line.split() for line in f)
+    for header in lines:
+        if not header:
+            continue
+        n, l, k = map(int, header)
+        pieces = [tuple(map(int, line)) for line in islice(lines, k)]
+        if len(pieces) != k:
+            raise ValueError("Problem " + " ".join(header) + " has less than " + str(k) + " pieces")
+        yield n, l, pieces
+
 def read_input(filename: str) -> tuple:
     with open(filename, 'r') as f:
-        n, l, k = map(int, f.readline().strip().split())
-        pieces = [tuple(map(int, f.readline().strip().split())) for _ in range(k)]
-    return n, l, pieces
+        return next(read_problems(f))
 
 class Chess:
-    def __init__(self, dimensions: int, board: list[list[int]], _moves: tuple[tuple[int, int], ...]=None):
+    def __init__(self, dimensions, board: list[list[int]], _moves: tuple[tuple[int, int], ...]=None,
+                 blocking: bool = False):
         """
         Initializing class with basic chess functions
-        :param dimensions: Size of the board
-        :param board: Two-dimensional list
-        :param _moves: Moves of pieces that can be placed on the board
+        :param dimensions: Size of the board or tuple (rows, columns) of the rectangular board
+        :param board: Two-dimensional list, numpy array or SparseBoard created by create_board
+        :param _moves: Moves of pieces that can be placed on the board. Rays are given as all their moves,
+        see rays.ray_moves
+        :param blocking: if True, a ray stops at the first piece standing on it
         """
         if _moves is None:
-            self.__moves = (
-            (0, -1), (0, 1), (3, 0), (-3, 0), (0, -3), (0, 3), (-1, -2), (-1, 2), (-1, 0), (1, -2), (1, 2), (1, 0),
-            (-2, -1),
-            (-2, 1), (2, -1), (2, 1))
+            self.__moves = DEFAULT_MOVES
         else:
             self.__moves = _moves
 
         self.__dimensions = dimensions
+        self.__rows, self.__columns = board_shape(dimensions)
         self.__board = board
-        self._placed_pieces = []
+        self._placed_pieces = {} # coordinates of placed pieces in the order they were placed, values are not used
+        self.__targets = _Targets(dimensions, self.__moves)
+        self.__blocking = blocking and bool(self.__targets.directions)
+        self.__blocked = {} # squares attacked by pieces placed with blocked rays, so the same ones are removed
 
     def print(self) -> None:
         """
         Prints board beautifully
         :return: None
         """
-        s = str(self.__board).replace('], [', '] \n [').replace(', ', ' ').replace('[', '').replace(']', '') + '\n'
+        s = str([[int(i) for i in row] for row in self.__board]).replace('], [', '] \n [').replace(', ', ' ').replace('[', '').replace(']', '') + '\n'
         res = ""
         for i in s.split(sep=" "):
             if i == '\n':
@@ -43,13 +151,22 @@ class Chess:
         print(res + '\n')
 
     @staticmethod
-    def create_board(dimensions: int) -> list[list[int]]:
+    def create_board(dimensions, numpy_board: bool = False, sparse: bool = False) -> list[list[int]]:
         """
         Creates two-dimensional list
-        :param dimensions: Size of the board
+        :param dimensions: Size of the board or tuple (rows, columns) of the rectangular board
+        :param numpy_board: if True, numpy array of int8 is created instead of list
+        :param sparse: if True, SparseBoard is created instead of list, it keeps only squares, that are not 0
         :return: two-dimensional list
         """
-        return [[0 for i in range(dimensions)] for j in range(dimensions)]
+        rows, columns = board_shape(dimensions)
+        if numpy_board and sparse:
+            raise ValueError("Board can not be both numpy array and sparse")
+        if numpy_board:
+            return create_numpy_board(dimensions)
+        if sparse:
+            return SparseBoard(rows, columns)
+        return [[0 for i in range(columns)] for j in range(rows)]
 
     def __change_piece(self, x: int, y: int, action: bool) -> list[tuple[int, int]]: # action: True - place; False - remove
         """
@@ -59,41 +176,75 @@ class Chess:
         :param action: True - place piece. False - remove piece
         :return: list with tuples, that contain x and y coordinates of attacked tiles
         """
-        coord_under_atck = []
-        if x > self.__dimensions - 1 or y > self.__dimensions - 1:
+        if x > self.__rows - 1 or y > self.__columns - 1:
             raise IndexError("Index is out of range!")
-        self.__board[x][y] = action * -1
+        board = self.__board
+        if not self.__blocking:
+            coord_under_atck = list(self.__targets[(x, y)][2])
+        elif action:
+            coord_under_atck = self.__blocked[(x, y)] = self.__blocked_targets(x, y)
+        else:
+            coord_under_atck = self.__blocked.pop((x, y), None) or self.__blocked_targets(x, y)
         action = (2 * action) - 1 # returns 1 if action is True; return -1 if action is False
-        for i in self.__moves:
-            if x + i[0] < 0 or y + i[1] < 0 or x + i[0] > self.__dimensions - 1 or y + i[1] > self.__dimensions - 1:
-                continue
-            else:
-                self.__board[x + i[0]][y + i[1]] += action
-                coord_under_atck.append((x + i[0], y + i[1]))
+        # a piece is -1, attacks of pieces with asymmetric moves are added to it and stay after it is removed
+        board[x][y] -= action
+        for tx, ty in coord_under_atck:
+            board[tx][ty] += action
         return coord_under_atck
 
+    def __blocked_targets(self, x: int, y: int) -> list[tuple[int, int]]:
+        """
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: list with coordinates of squares attacked from x, y, when rays stop at the first piece
+        """
+        leaps, rays, _ = self.__targets[(x, y)]
+        board = self.__board
+        targets = list(leaps)
+        for ray in rays:
+            for tx, ty in ray:
+                targets.append((tx, ty))
+                if board[tx][ty] == -1:
+                    break
+        return targets
+
     def place_piece(self, x: int, y: int) -> list[tuple[int, int]]:
         """
-        Places piece on the board.
+        Places piece on the board. A square holding a piece is not taken again, even if attacks of pieces
+        with asymmetric moves made it 0
         :param x: X coordinate
         :param y: Y coordinate
         :return: list containing tuples, with x and y coordinates of attacks
         """
-        if self.__board[x][y] == 0:
-            self._placed_pieces.append((x, y))
+        if self.__board[x][y] == 0 and (x, y) not in self._placed_pieces:
+            self._placed_pieces[(x, y)] = None
             coord = self.__change_piece(x, y, True)
             return coord
         return []
 
     def place_pieces(self, pieces: list[tuple[int, int], ]) -> None:
         """
-        Places a bunch of pieces on the board
+        Places a bunch of pieces on the board. On numpy board all pieces are placed at once, when none of them
+        stands on a square, that is taken or attacked by pieces placed before it
         :param pieces: List that contains coordinates of pieces
         :return: List that contains tuples with coordinates of piece's attacks
         """
+        if is_numpy_board(self.__board) and len(pieces) > 1 and not self.__blocking:
+            if place_numpy_pieces(self.__board, self.__moves, pieces):
+                for x, y in pieces:
+                    self._placed_pieces[(int(x), int(y))] = None
+                return None
         for i in pieces:
             self.place_piece(i[0], i[1])
 
+    def non_attacking(self, candidates):
+        """
+        Checks many candidate placements at once with numpy. Works for both kinds of boards
+        :param candidates: Array-like of shape (amount of candidates, pieces in candidate, 2) with coordinates
+        :return: Array of bools, True for candidates, which pieces stand on free squares and do not attack each other
+        """
+        return non_attacking(self.__dimensions, self.__moves, candidates, self.__board)
+
     def remove_piece(self, x: int, y: int) -> list[tuple[int, int]]:
         """
         Removes piece of the board
@@ -106,110 +257,700 @@ class Chess:
             return coord
         return []
 
+    def delete_piece(self, x: int, y: int) -> list[tuple[int, int]]:
+        """
+        Removes piece of the board and from placed pieces. remove_piece keeps placed pieces,
+        since the search removes the last one itself. Other placed pieces keep their order
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: List that contains tuples with coordinates of piece's removed attacks
+        """
+        if (x, y) not in self._placed_pieces:
+            return []
+        del self._placed_pieces[(x, y)]
+        return self.__change_piece(x, y, False)
+
+    def attacked_squares(self, x: int, y: int) -> list[tuple[int, int]]:
+        """
+        Finds squares, that a piece on x, y attacks, without placing it
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: List that contains tuples with coordinates of attacks
+        """
+        if not self.__blocking:
+            return list(self.__targets[(x, y)][2])
+        return self.__blocked_targets(x, y)
+
 class ChessSolver(Chess):
-    def __init__(self, dimensions: int, output_file: str = 'output.txt', _moves=None):
+    def __init__(self, dimensions, output_file: str = 'output.txt', _moves=None, numpy_board: bool = False,
+                 rays: tuple[tuple[int, int], ...] = (), blocking: bool = False, sparse: bool | None = None):
         """
         Initializing class that adds algorithm of solving chess
-        :param dimensions: Size of the board
+        :param dimensions: Size of the board or tuple (rows, columns) of the rectangular board
         :param output_file: File, where all solutions will be written to
         :param _moves: Moves of a piece
+        :param numpy_board: if True, the board is numpy array of int8, so place_pieces places all pieces at once.
+        numpy is required then
+        :param rays: Directions (dx, dy), in which the piece attacks every square up to the edge of the board,
+        for example rays.ROOK or rays.QUEEN. They are added to moves
+        :param blocking: if True, a ray stops at the first piece standing on it. Every ray needs a ray
+        in the opposite direction then: a piece blocking the ray is attacked itself, so solutions are the same
+        as without blocking and all search engines find them in the same order
+        :param sparse: if True, the board is SparseBoard, that keeps only occupied and attacked squares.
+        Bitmasks of the whole board are not built for it: solutions are searched without recursion in the same order,
+        first_solutions takes squares in row order, solve and symmetric search are not available.
+        None - boards with more than SPARSE_SQUARES squares, that are not numpy arrays, are sparse
         """
-        self.__board = self.create_board(dimensions)
+        rows, columns = board_shape(dimensions)
+        if sparse is None:
+            sparse = not numpy_board and rows * columns > SPARSE_SQUARES
+        self.__board = self.create_board(dimensions, numpy_board, sparse)
         if _moves is None:
-            self._moves = (
-            (0, -1), (0, 1), (3, 0), (-3, 0), (0, -3), (0, 3), (-1, -2), (-1, 2), (-1, 0), (1, -2), (1, 2), (1, 0),
-            (-2, -1),
-            (-2, 1), (2, -1), (2, 1))
+            self._moves = DEFAULT_MOVES
         else:
             self._moves = _moves
-        super().__init__(dimensions, self.__board, self._moves)
-        self.__cache = set()
+        if rays:
+            self._moves = tuple(self._moves) + tuple(move for move in ray_moves(rays, dimensions)
+                                                     if move not in self._moves)
+        missing = opposite_missing(split_rays(self._moves, dimensions)[1]) if blocking else []
+        if missing:
+            raise ValueError("Blocking ray without opposite direction: " + str(missing[0]))
+        super().__init__(dimensions, self.__board, self._moves, blocking)
         self.__cur_solution = []
         self.output_file = output_file
         self.__dimensions = dimensions
+        self.__rows, self.__columns = rows, columns
+        self.__sparse = sparse
         self.__const_pieces = self._placed_pieces
+        self.cache_hit = False # True if the result of the last compute was taken from the cache
+        self.stats: SearchStats | None = None # statistics of the last search, None - not collected
 
     @property
     def board(self):
         return self.__board
 
     @property
-    def pieces(self):
-        return self.__const_pieces
+    def pieces(self) -> list[tuple[int, int]]:
+        return list(self.__const_pieces)
+
+    def enable_stats(self, hook=None, every: int = HOOK_NODES) -> SearchStats:
+        """
+        Turns on collecting of statistics. Every search clears them and fills them again.
+        Symmetric search and search in several processes do not collect them
+        :param hook: Function, that is called with statistics every `every` visited squares and when the search is over.
+        It can stop the search by raising an exception
+        :param every: Amount of visited squares between two calls of the hook
+        :return: Statistics, the same as stats attribute
+        """
+        self.stats = SearchStats(hook, every)
+        return self.stats
+
+    def disable_stats(self) -> None:
+        """
+        Turns off collecting of statistics, searches run code that does not count anything
+        :return: None
+        """
+        self.stats = None
 
-    def __algorithm(self, x: int = 0, y: int = 0, l = 0) -> None:
+    def __algorithm(self, x: int = 0, y: int = 0, l = 0):
         """
-        Algorithm of finding and writing to the file all possible solutions
+        Algorithm of finding all possible solutions
         :param x: X coordinate
         :param y: Y coordinate
         :param l: Amount of pieces that needs to be placed
-        :return: None
+        :return: Generator of tuples with coordinates of pieces
         """
-        if l == 0:
-            self.__cur_solution.sort()
-            cur_solution_t = tuple(self.__cur_solution)
-            if cur_solution_t in self.__cache:
-                return None
-            self.__cache.update(cur_solution_t)
-            answ = self.__const_pieces + self.__cur_solution
-            for el in answ:
-                self.__f.write(str(el) + " ")
-            self.__f.write('\n')
+        if l == 0: # squares are visited in increasing order, so every solution is found once and already sorted
+            yield tuple(self.__const_pieces + self.__cur_solution)
             return None
-        for i in range(x, self.__dimensions):
-            for j in range(y if i == x else 0, self.__dimensions):
-                if self.__board[i][j] == 0:
+        for i in range(x, self.__rows):
+            for j in range(y if i == x else 0, self.__columns):
+                if self.__board[i][j] == 0 and (i, j) not in self._placed_pieces:
                     self.__cur_solution.append((i, j))
                     self.place_piece(i, j)
-                    self.__algorithm(i, j, l - 1)
-                    self.remove_piece(i, j)
-                    self.__cur_solution.pop()
+                    try:
+                        yield from self.__algorithm(i, j, l - 1)
+                    finally: # board is restored even if the caller stops iterating
+                        self.remove_piece(i, j)
+                        self._placed_pieces.popitem()
+                        self.__cur_solution.pop()
         return None
 
-    def __algorithm_with_end(self, x: int = 0, y: int = 0, l = 0) -> list[tuple[int, int],]:
+    def __algorithm_with_stats(self, x: int, y: int, l: int, stats: SearchStats, progress=None):
         """
-        Algorithm that returns first found solution
+        The same algorithm, that also collects statistics. It is kept apart, so algorithm does not pay for counting
         :param x: X coordinate
         :param y: Y coordinate
         :param l: Amount of pieces that needs to be placed
-        :return: First found solution
+        :param stats: Statistics of the search
+        :param progress: Function, that is called with amounts of visited squares and found solutions,
+        when the hook of statistics is called
+        :return: Generator of tuples with coordinates of pieces
         """
+        depth = len(self.__cur_solution)
         if l == 0:
-            self.__cur_solution.sort()
-            cur_solution_t = tuple(self.__cur_solution)
-            if cur_solution_t in self.__cache:
-                return self.__const_pieces + self.__cur_solution
-            self.__cache.update(cur_solution_t)
-            answ = self.__const_pieces + self.__cur_solution
-            return answ
-        for i in range(x, self.__dimensions):
-            for j in range(y if i == x else 0, self.__dimensions):
-                if self.__board[i][j] == 0:
+            if not stats.leaves:
+                stats.first_solution_seconds = stats.elapsed()
+            stats.leaves += 1
+            yield tuple(self.__const_pieces + self.__cur_solution)
+            if not depth: # nothing to place, the search is over as well
+                stats.report(progress)
+            return None
+        for i in range(x, self.__rows):
+            for j in range(y if i == x else 0, self.__columns):
+                if self.__board[i][j] == 0 and (i, j) not in self._placed_pieces:
+                    stats.nodes[depth] += 1
+                    stats.visited += 1
+                    if not stats.visited % stats.every:
+                        stats.report(progress)
                     self.__cur_solution.append((i, j))
                     self.place_piece(i, j)
-                    a = self.__algorithm_with_end( i, j, l - 1)
-                    return a
-        return []
+                    try:
+                        yield from self.__algorithm_with_stats(i, j, l - 1, stats, progress)
+                    finally:
+                        self.remove_piece(i, j)
+                        self._placed_pieces.popitem()
+                        self.__cur_solution.pop()
+                        if l > 1: # as in the bitboard engine, taking back the last piece of a solution is not counted
+                            stats.backtracks += 1
+        if not depth: # the whole search is over
+            stats.report(progress)
+        return None
 
-    def compute(self, amount_of_pieces: int, end = -1) -> None | list:
+    def __row_capacity(self) -> int:
         """
-        Wrapper of algorithm and algorithm with first solution
+        When a piece attacks every following square of its row closer than k, k squares in a row hold
+        at most one piece
+        :return: The largest amount of pieces, that one row can hold
+        """
+        moves = set(self._moves)
+        k = 1
+        while k < self.__columns and (0, k) in moves:
+            k += 1
+        return -(-self.__columns // k)
+
+    def __sparse_algorithm(self, l: int, stats: SearchStats, progress=None):
+        """
+        Algorithm of finding all possible solutions on sparse board. Squares are taken in the same order as in
+        algorithm, a piece is placed first and then the square is left empty. Placed pieces are kept in a list
+        instead of recursion, so any amount of pieces can be placed. Only squares, that are not 0, are stored,
+        so the next free square is found by skipping them. A branch is cut, when the rows left can not hold
+        the pieces left, even if every row held as many pieces as a row can hold
+        :param l: Amount of pieces that needs to be placed
+        :param stats: Statistics of the search
+        :param progress: Function, that is called with amounts of visited squares and found solutions,
+        when the hook of statistics is called
+        :return: Generator of tuples with coordinates of pieces
+        """
+        rows, columns = self.__rows, self.__columns
+        size = rows * columns
+        values = self.__board.values
+        pieces = {x * columns + y for x, y in self._placed_pieces} # attacks of asymmetric moves can make them 0
+        row_capacity = self.__row_capacity()
+        solution = self.__cur_solution
+        placed = [] # numbers of squares of pieces placed by the search
+        nodes = stats.nodes = [0] * l
+        visited = backtracks = prunes = leaves = 0
+        report = stats.every
+        sq = 0 # the next square, where a piece is tried
+        try:
+            while True:
+                left = l - len(placed)
+                if not left:
+                    if not leaves:
+                        stats.first_solution_seconds = stats.elapsed()
+                    leaves += 1
+                    yield tuple(self.__const_pieces + solution)
+                else:
+                    while sq < size and (sq in values or sq in pieces):
+                        sq += 1
+                    x, y = divmod(sq, columns)
+                    if sq < size and min(columns - y, row_capacity) + (rows - x - 1) * row_capacity >= left:
+                        nodes[len(placed)] += 1
+                        visited += 1
+                        if visited >= report:
+                            stats.visited, stats.backtracks, stats.prunes, stats.leaves = (visited, backtracks,
+                                                                                           prunes, leaves)
+                            stats.report(progress)
+                            report = visited + stats.every
+                        placed.append(sq)
+                        solution.append((x, y))
+                        self.place_piece(x, y)
+                        sq += 1
+                        continue
+                    if sq < size:
+                        prunes += 1
+                if not placed:
+                    break
+                if left: # taking back the last piece of a solution is not counted
+                    backtracks += 1
+                sq = placed.pop() # the square of the piece is left empty, the search goes on from the next one
+                self.remove_piece(*solution.pop())
+                self._placed_pieces.popitem()
+                sq += 1
+        finally: # board is restored and counters are kept, even if the caller stops iterating
+            while placed:
+                placed.pop()
+                self.remove_piece(*solution.pop())
+                self._placed_pieces.popitem()
+            stats.visited, stats.backtracks, stats.prunes, stats.leaves = visited, backtracks, prunes, leaves
+        stats.report(progress)
+
+    def __bitboard_algorithm(self, l: int, symmetry: bool = False, expand: bool = True, progress=None,
+                             stats: SearchStats | None = None, decompose: bool = False):
+        """
+        Algorithm of finding all possible solutions, that keeps the board in bitmasks
+        :param l: Amount of pieces that needs to be placed
+        :param symmetry: if True, only one solution of every group of symmetric solutions is searched
+        :param expand: if True, symmetric solutions are yielded after the found one
+        :param progress: Function, that is called with amounts of visited squares and found solutions
+        :param stats: if given, statistics of the search are collected there
+        :param decompose: if True, regions of free squares are searched separately
+        :return: Generator of tuples with coordinates of pieces
+        """
+        bitboard = BitBoard(self.__dimensions, self._moves)
+        coordinates = [bitboard.coordinates(sq) for sq in range(bitboard.size)]
+        const_pieces = tuple(self.__const_pieces)
+        free = bitboard.free_squares(self.__board, self._placed_pieces)
+        if symmetry:
+            group = Symmetry(bitboard, self._moves, free)
+            solutions = group.solutions(free, l)
+            if expand:
+                solutions = (image for solution in solutions for image in group.orbit(solution))
+        elif decompose:
+            solutions = Regions(bitboard, self._moves, free, l).solutions(l)
+        else:
+            solutions = bitboard.solutions(free, l, progress, stats)
+        for solution in solutions:
+            yield const_pieces + tuple([coordinates[sq] for sq in solution])
+
+    def __solutions(self, l: int, engine: str, start: int, stop: int | None, symmetry: bool, expand: bool,
+                    progress, decompose: bool = False):
+        """
+        Runs chosen algorithm and stops it, when iteration is over or stopped
+        :param l: Amount of pieces that needs to be placed
+        :param engine: Name of the engine
+        :param start: Number of the first yielded solution
+        :param stop: Number of the solution, before which iteration stops. None - no limit
+        :param symmetry: if True, only one solution of every group of symmetric solutions is searched
+        :param expand: if True, symmetric solutions are yielded after the found one
+        :param progress: Function, that is called with amounts of visited squares and found solutions
+        :param decompose: if True, regions of free squares are searched separately
+        :return: Generator of tuples with coordinates of pieces
+        """
+        stats = self.stats
+        if self.__sparse:
+            if l > self.__rows * self.__columns - len(self.__board.values):
+                return None # less free squares than pieces, only squares, that are not free, are stored
+            algorithm = self.__sparse_algorithm(l, SearchStats(every=PROGRESS_NODES) if stats is None else stats,
+                                                progress)
+        elif engine == 'bitboard' or symmetry or decompose or progress is not None:
+            algorithm = self.__bitboard_algorithm(l, symmetry, expand, progress, stats, decompose)
+        else:
+            bitboard = BitBoard(self.__dimensions, self._moves)
+            if bitboard.capacity(bitboard.free_squares(self.__board, self._placed_pieces)) < l:
+                if stats is not None:
+                    stats.prunes += 1
+                return None # not enough room for l pieces, no need to search
+            if stats is None:
+                algorithm = self.__algorithm(l=l)
+            else:
+                stats.nodes = [0] * l
+                algorithm = self.__algorithm_with_stats(0, 0, l, stats)
+        try:
+            yield from islice(algorithm, start, stop)
+        finally:
+            algorithm.close()
+
+    def iter_solutions(self, amount_of_pieces: int, limit: int | None = None, offset: int | None = None,
+                       engine: str = 'bitboard', symmetry: bool = False, expand: bool = True, progress=None,
+                       decompose: bool = False):
+        """
+        Lazily yields all solutions in the same order, as compute writes them to the file
         :param amount_of_pieces: Amount of pieces that needs to be placed
-        :param end: if not -1 then executes algorithm of finding first solution
-        :return: None or first solution
+        :param limit: Maximum amount of yielded solutions. None - all solutions
+        :param offset: Amount of first solutions, that are skipped
+        :param engine: 'list' - search on two-dimensional list, 'bitboard' - search on bitmasks.
+        Sparse board is always searched by its own search, that keeps the same order
+        :param symmetry: if True, rotations and reflections of the board, that keep moves and free squares, are found
+        and only the lexicographically smallest solution of every group of symmetric solutions is searched on bitmasks
+        :param expand: if True, symmetric solutions follow the found one, so all solutions are yielded,
+        but grouped by symmetry instead of lexicographic order. if False, only the smallest ones are yielded
+        :param progress: Function, that is called with amounts of visited squares and found solutions every
+        bitboard.PROGRESS_NODES visited squares. It can stop the search by raising an exception.
+        Search with progress runs on bitmasks, symmetric search does not call it
+        :param decompose: if True, free squares are split into regions, pieces in which do not attack each other,
+        and solutions are built from placements of regions as lazy Cartesian product on bitmasks.
+        They are grouped by amounts of pieces in regions instead of lexicographic order.
+        Symmetric search, progress and statistics are not used then
+        :return: Generator of tuples with coordinates of already placed pieces followed by placed ones
         """
-        self.__const_pieces = self._placed_pieces.copy()
-        self.__f = open(self.output_file, 'w')
-        if amount_of_pieces > self.__dimensions * self.__dimensions:
-            self.__f.write('no solutions')
-            self.__f.close()
-        elif end == -1:
-            self.__algorithm(l=amount_of_pieces)
+        if engine not in ENGINES:
+            raise ValueError("Unknown engine: " + str(engine))
+        if (symmetry or decompose) and self.__sparse:
+            raise ValueError("Symmetric search and regions need bitmasks, they are not available on sparse board")
+        if symmetry and decompose:
+            raise ValueError("Symmetric search can not be split into regions")
+        self.__const_pieces = list(self._placed_pieces)
+        if self.stats is not None:
+            self.stats.reset()
+        start = offset or 0
+        stop = None if limit is None else start + limit
+        return self.__solutions(amount_of_pieces, engine, start, stop, symmetry, expand, progress, decompose)
+
+    def regions(self) -> list[list[tuple[int, int]]]:
+        """
+        Splits free squares into regions, pieces in which can not attack pieces in other regions
+        :return: List of regions with coordinates of their squares in row-major order
+        """
+        if self.__sparse:
+            raise ValueError("Regions need bitmasks, they are not available on sparse board")
+        bitboard = BitBoard(self.__dimensions, self._moves)
+        return [[bitboard.coordinates(sq) for sq in range(region.bit_length()) if region >> sq & 1]
+                for region in components(bitboard, bitboard.free_squares(self.__board, self._placed_pieces))]
+
+    def __parallel_algorithm(self, l: int, processes: int, split_depth: int) -> None:
+        """
+        Algorithm of finding and writing to the file all possible solutions in several processes
+        :param l: Amount of pieces that needs to be placed
+        :param processes: Amount of worker processes
+        :param split_depth: Amount of first placed pieces, by which search tree is split between processes
+        :return: None
+        """
+        bitboard = BitBoard(self.__dimensions, self._moves)
+        prefix = "".join(str(el) + " " for el in self.__const_pieces)
+        free = bitboard.free_squares(self.__board, self._placed_pieces)
+        write_parallel(self.__f, bitboard, free, l, prefix, processes, split_depth,
+                       os.path.dirname(os.path.abspath(self.output_file)))
+
+    def first_solutions(self, amount_of_pieces: int, k: int = 1, order: str = 'row',
+                        progress=None) -> list[tuple]:
+        """
+        Finds up to k different solutions with backtracking search. Solutions are not in lexicographic order,
+        the search takes squares in the chosen order to reach a solution quickly
+        :param amount_of_pieces: Amount of pieces that needs to be placed
+        :param k: Maximum amount of solutions
+        :param order: 'row' - squares are taken in row-major order,
+        'fewest_removed' - the square, a piece on which removes the fewest free squares, is taken first.
+        It counts removed squares of every free square at every step, so it is slow on large boards
+        :param progress: Function, that is called with amounts of visited squares and found solutions.
+        It can stop the search by raising an exception
+        :return: List of tuples with coordinates of already placed pieces followed by placed ones
+        """
+        if order not in ORDERS:
+            raise ValueError("Unknown order: " + str(order))
+        if self.__sparse: # squares of sparse board are taken in row-major order
+            return list(self.iter_solutions(amount_of_pieces, limit=k, engine='list', progress=progress))
+        if self.stats is not None:
+            self.stats.reset()
+        bitboard = BitBoard(self.__dimensions, self._moves)
+        const_pieces = tuple(self._placed_pieces)
+        free = bitboard.free_squares(self.__board, self._placed_pieces)
+        solutions = bitboard.first_solutions(free, amount_of_pieces, order, progress, self.stats)
+        return [const_pieces + tuple([bitboard.coordinates(sq) for sq in solution]) for solution in islice(solutions, k)]
+
+    def solve(self, amount_of_pieces: int, k: int = 1, deadline: float | None = None, max_nodes: int | None = None,
+              order: str = 'row', resume: SolveResult | None = None) -> SolveResult:
+        """
+        Searches up to k different solutions, but stops, when time or visited squares are over.
+        The search can be continued by the next call with the result of this one, it does not repeat found solutions
+        :param amount_of_pieces: Amount of pieces that needs to be placed
+        :param k: Maximum amount of solutions found by this call
+        :param deadline: Seconds, after which the search stops. None - no limit
+        :param max_nodes: Amount of visited squares, after which the search stops. None - no limit
+        :param order: 'row' or 'fewest_removed', see first_solutions. Continued search keeps its order
+        :param resume: Result of the previous call for the same problem. Search continues from its state,
+        even if pieces were placed or removed since then
+        :return: Instance of SolveResult. complete is False, when the search was cut off by deadline or max_nodes
+        or stopped after k solutions with part of the tree left
+        """
+        if self.__sparse:
+            raise ValueError("solve keeps the search in bitmasks, it is not available on sparse board")
+        if resume is None:
+            if order not in ORDERS:
+                raise ValueError("Unknown order: " + str(order))
+            bitboard = BitBoard(self.__dimensions, self._moves)
+            state = SearchState(bitboard.free_squares(self.__board, self._placed_pieces), amount_of_pieces)
+            pieces = tuple(self._placed_pieces)
+        else:
+            bitboard = BitBoard(self.__dimensions, self._moves)
+            state, pieces, order = resume.state, resume.pieces, resume.order
+        stop_time = None if deadline is None else time.monotonic() + deadline
+        stop_nodes = None if max_nodes is None else state.nodes + max_nodes
+        solutions = []
+        search = bitboard.resume_first_solutions(state, order)
+        for solution in search:
+            if solution is not None:
+                solutions.append(pieces + tuple([bitboard.coordinates(sq) for sq in solution]))
+                if len(solutions) >= k:
+                    break
+            if stop_time is not None and time.monotonic() >= stop_time:
+                break
+            if stop_nodes is not None and state.nodes >= stop_nodes:
+                break
+        search.close()
+        return SolveResult(solutions, state.finished, state, pieces, order)
+
+    def count(self, amount_of_pieces: int, cache: ResultCache | None = None, mode: str = 'profile',
+              table: TranspositionTable | None = None) -> int:
+        """
+        Counts all solutions without enumerating them. Already placed pieces are taken into account.
+        Solutions on sparse board are enumerated, as counting needs bitmasks of the whole board,
+        so only small amounts of pieces are counted there
+        :param amount_of_pieces: Amount of pieces that needs to be placed
+        :param cache: if given, amount is taken from the cache, when the same problem was already solved,
+        otherwise it is stored there
+        :param mode: 'profile' - dynamic programming over the board profile, row by row,
+        'transposition' - search, that remembers sub-problems in transposition table of bounded size.
+        The second one keeps memory bounded, when the profile has too many states.
+        When the profile has more than counting.PROFILE_STATES states or needs more than counting.PROFILE_WORK,
+        which happens on wide boards with few pieces, 'profile' counts by 'transposition'.
+        'regions' - every region of free squares, pieces in which do not attack other regions, is counted
+        by profile for every amount of pieces, and amounts are combined by convolution.
+        It raises counting.ProfileTooLarge, when the profile of a region has too many states
+        :param table: Transposition table for 'transposition' mode, its counters tell how many sub-problems were found
+        there. None - table of counting.TABLE_SIZE entries
+        :return: Amount of solutions
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError("Unknown count mode: " + str(mode))
+        problem = (self.__dimensions, self._moves, list(self._placed_pieces), amount_of_pieces)
+        self.cache_hit = False
+        if cache is not None:
+            count = cache.lookup_count(*problem)
+            if count is not None:
+                self.cache_hit = True
+                return count
+        if self.__sparse: # sparse board has no bitmasks, solutions are enumerated
+            count = sum(1 for _ in self.iter_solutions(amount_of_pieces, engine='list'))
+        else:
+            bitboard = BitBoard(self.__dimensions, self._moves)
+            free = bitboard.free_squares(self.__board, self._placed_pieces)
+            if mode == 'transposition':
+                count = count_transpositions(bitboard, free, amount_of_pieces, table)
+            elif mode == 'regions':
+                count = Regions(bitboard, self._moves, free, amount_of_pieces).count(amount_of_pieces)
+            else:
+                try:
+                    count = count_placements(self.__dimensions, self._moves, free, amount_of_pieces)
+                except ProfileTooLarge: # transposition table keeps memory bounded
+                    count = count_transpositions(bitboard, free, amount_of_pieces, table)
+        if cache is not None:
+            cache.store_count(*problem, count)
+        return count
+
+    def __write(self, amount_of_pieces: int, engine: str, processes: int, split_depth: int, symmetry: bool,
+                expand: bool, file_format: str, compression: str, progress) -> None:
+        """
+        Writes all solutions to the output file
+        :param amount_of_pieces: Amount of pieces that needs to be placed
+        :param engine: Name of the engine
+        :param processes: Amount of worker processes
+        :param split_depth: Amount of first placed pieces, by which search tree is split between processes
+        :param symmetry: if True, only one solution of every group of symmetric solutions is searched
+        :param expand: if True, symmetric solutions are written after the found one
+        :param file_format: Name of the file format
+        :param compression: Name of the compression of text file
+        :param progress: Function, that is called with amounts of visited squares and found solutions
+        :return: None
+        """
+        if file_format == 'binary':
+            solutions = ()
+            if amount_of_pieces <= self.__rows * self.__columns:
+                solutions = self.iter_solutions(amount_of_pieces, engine=engine, symmetry=symmetry, expand=expand,
+                                                progress=progress)
+            with open(self.output_file, 'wb') as f:
+                out = f if self.stats is None else _TimedFile(f, self.stats)
+                write_binary(out, self.__dimensions, amount_of_pieces, self._moves, self.__const_pieces, solutions)
+            return None
+        self.__f = open_text(self.output_file, compression)
+        try: # file is closed even if progress stops the search
+            if amount_of_pieces > self.__rows * self.__columns:
+                self.__f.write('no solutions')
+            elif processes > 1 and amount_of_pieces > 0 and not symmetry and not self.__sparse:
+                self.__parallel_algorithm(amount_of_pieces, processes, split_depth)
+            else:
+                # solutions are formatted, compressed and written in the writer thread, while the search goes on
+                with SolutionWriter(self.__f if self.stats is None else _TimedFile(self.__f, self.stats)) as writer:
+                    writer.write(self.iter_solutions(amount_of_pieces, engine=engine, symmetry=symmetry,
+                                                     expand=expand, progress=progress))
+        finally:
             self.__f.close()
+        return None
+
+    def shard_count(self, amount_of_pieces: int, shard_depth: int = 1) -> int:
+        """
+        :param amount_of_pieces: Amount of pieces that needs to be placed
+        :param shard_depth: Amount of first placed pieces, that define a shard
+        :return: Amount of shards, that compute can be given
+        """
+        if self.__sparse:
+            raise ValueError("Shards are found on bitmasks, they are not available on sparse board")
+        bitboard = BitBoard(self.__dimensions, self._moves)
+        free = bitboard.free_squares(self.__board, self._placed_pieces)
+        return len(bitboard.shards(free, amount_of_pieces, shard_depth))
+
+    def __write_shards(self, amount_of_pieces: int, shards: tuple[int, int] | None, shard_depth: int,
+                       checkpoint: str | None, compression: str, progress) -> None:
+        """
+        Writes solutions of the range of shards to the output file, saving the state of the search to the checkpoint.
+        When the checkpoint exists, the search continues from it, solutions written after it are removed from the file
+        :param amount_of_pieces: Amount of pieces that needs to be placed
+        :param shards: Numbers of the first shard and the shard after the last one. None - all shards
+        :param shard_depth: Amount of first placed pieces, that define a shard
+        :param checkpoint: Name of the checkpoint file. None - the state is not saved
+        :param compression: Name of the compression of text file
+        :param progress: Function, that is called with amounts of visited squares and found solutions
+        :return: None
+        """
+        bitboard = BitBoard(self.__dimensions, self._moves)
+        coordinates = [bitboard.coordinates(sq) for sq in range(bitboard.size)]
+        const_pieces = tuple(self.__const_pieces)
+        free = bitboard.free_squares(self.__board, self._placed_pieces)
+        prefixes = bitboard.shards(free, amount_of_pieces, shard_depth)
+        first, last = (0, len(prefixes)) if shards is None else shards
+        if not 0 <= first <= last <= len(prefixes):
+            raise ValueError("Shards are out of range: " + str(shards))
+        problem = (self.__dimensions, self._moves, const_pieces, amount_of_pieces, first, last, shard_depth)
+        saver = None if checkpoint is None else Checkpoint(checkpoint)
+        saved = None if saver is None else saver.load(problem)
+        state = None
+        if saved is None:
+            self.__f = open_text(self.output_file, compression)
         else:
-            answ = self.__algorithm_with_end(end, l=amount_of_pieces)
+            first, state, offset = saved
+            if os.path.getsize(self.output_file) < offset:
+                raise ValueError("Output file is shorter than the checkpoint")
+            os.truncate(self.output_file, offset) # solutions written after the checkpoint are found again
+            self.__f = open(self.output_file, 'a')
+        visited = 0 # visited squares of finished shards
+        found = 0
+        next_tick = PROGRESS_NODES # visited squares of all shards, after which progress is called and checkpoint saved
+
+        def save(shard: int) -> None:
+            writer.flush()
+            self.__f.flush()
+            os.fsync(self.__f.fileno())
+            saver.save(problem, shard, state, self.__f.tell())
+
+        try: # file is closed even if progress stops the search
+            if amount_of_pieces > self.__rows * self.__columns:
+                self.__f.write('no solutions')
+            with SolutionWriter(self.__f if self.stats is None else _TimedFile(self.__f, self.stats)) as writer:
+                for shard in range(first, last):
+                    if state is None:
+                        state = EnumerationState(bitboard.after(free, prefixes[shard]), amount_of_pieces,
+                                                 prefixes[shard])
+                    # ticks go on from the previous shard, so small shards do not restart them
+                    first_tick = max(1, next_tick - visited - state.nodes)
+                    for solution in bitboard.resume_solutions(state, PROGRESS_NODES, first_tick):
+                        if solution is not None:
+                            writer.put(const_pieces + tuple([coordinates[sq] for sq in solution]))
+                            continue
+                        next_tick = visited + state.nodes + PROGRESS_NODES
+                        if saver is not None and saver.due:
+                            save(shard)
+                        if progress is not None:
+                            progress(visited + state.nodes, found + state.found)
+                    if saver is not None and saver.due: # finished shard is skipped, when the search continues
+                        save(shard)
+                    visited += state.nodes
+                    found += state.found
+                    state = None
+            if progress is not None:
+                progress(visited, found)
+        finally:
             self.__f.close()
+        if saver is not None:
+            saver.remove()
+        return None
+
+    def compute(self, amount_of_pieces: int, end = -1, engine: str = 'list', processes: int = 1,
+                split_depth: int = 1, symmetry: bool = False, expand: bool = True,
+                file_format: str = 'text', cache: ResultCache | None = None, progress=None,
+                compression: str = 'none', checkpoint: str | None = None, shards: tuple[int, int] | None = None,
+                shard_depth: int = 1) -> None | list:
+        """
+        Wrapper of algorithm and algorithm with first solution
+        :param amount_of_pieces: Amount of pieces that needs to be placed
+        :param end: if not -1 then returns first found solution, nothing is written to the file
+        :param engine: 'list' - search on two-dimensional list, 'bitboard' - search on bitmasks.
+        Both engines write the same solutions in the same order
+        :param processes: if more than 1, all solutions are searched by bitboard engine in that many processes.
+        Sparse board is searched in this process
+        :param split_depth: Amount of first placed pieces, by which search tree is split between processes
+        :param symmetry: if True, only one solution of every group of symmetric solutions is searched.
+        processes are not used in that case
+        :param expand: if True, symmetric solutions are written after the found one
+        :param file_format: 'text' - solutions are written as lines of coordinates,
+        'binary' - header and fixed-width records of square numbers, that can be read by solution_file.SolutionFile.
+        processes are not used for binary format, it needs a square board
+        :param cache: if given, result is taken from the cache, when the same problem was already solved,
+        otherwise it is stored there. cache_hit tells whether the result was taken from the cache
+        :param progress: Function, that is called with amounts of visited squares and found solutions.
+        It can stop the search by raising an exception, nothing is stored in the cache then.
+        Solutions found before are still written
+        :param compression: 'none', 'gzip' or 'lzma' - compression of the text file. Binary file is not compressed
+        :param checkpoint: Name of the file, where the state of the search is saved every checkpoint.CHECKPOINT_SECONDS.
+        If it exists, the search continues from it and writes the rest of the solutions to the same output file.
+        It is removed, when all solutions are written. Only uncompressed text file can be continued
+        :param shards: Numbers of the first shard and the shard after the last one, only solutions of these shards
+        are written. Files of consecutive ranges of shards joined together are the same as the file of all solutions,
+        so ranges can be computed in different processes or on different machines. None - all shards
+        :param shard_depth: Amount of first placed pieces, that define a shard, see shard_count.
+        With checkpoint or shards solutions are searched on bitmasks in lexicographic order, processes are not used
+        and statistics are not collected
+        :return: None or first solution
+        """
+        if engine not in ENGINES:
+            raise ValueError("Unknown engine: " + str(engine))
+        if file_format not in FILE_FORMATS:
+            raise ValueError("Unknown file format: " + str(file_format))
+        if compression not in COMPRESSIONS:
+            raise ValueError("Unknown compression: " + str(compression))
+        if file_format == 'binary' and compression != 'none':
+            raise ValueError("Binary file is not compressed")
+        if file_format == 'binary' and self.__rows != self.__columns: # checked before the output file is opened
+            raise ValueError("Binary format needs a square board")
+        resumable = checkpoint is not None or shards is not None
+        if resumable and (file_format == 'binary' or symmetry or self.__sparse):
+            raise ValueError("Checkpoints and shards need text file and lexicographic search on bitmasks")
+        if checkpoint is not None and compression != 'none':
+            raise ValueError("Compressed file can not be continued from checkpoint")
+        self.__const_pieces = list(self._placed_pieces)
+        problem = (self.__dimensions, self._moves, self.__const_pieces, amount_of_pieces)
+        self.cache_hit = False
+        if self.stats is not None:
+            self.stats.reset()
+        if end != -1:
+            if cache is not None:
+                answ = cache.lookup_first(*problem)
+                if answ is not None:
+                    self.cache_hit = True
+                    return answ
+            solutions = self.first_solutions(amount_of_pieces, progress=progress)
+            answ = list(solutions[0]) if solutions else []
+            if cache is not None:
+                cache.store_first(*problem, answ)
             return answ
+        options = (file_format, symmetry, expand, compression)
+        if shards is not None:
+            options += (tuple(shards), shard_depth)
+        if cache is not None:
+            data = cache.lookup_file(*problem, *options)
+            if data is not None:
+                self.cache_hit = True
+                with open(self.output_file, 'wb') as f:
+                    f.write(data)
+                return None
+        if resumable:
+            self.__write_shards(amount_of_pieces, shards, shard_depth, checkpoint, compression, progress)
+        else:
+            self.__write(amount_of_pieces, engine, processes, split_depth, symmetry, expand, file_format, compression,
+                         progress)
+        if cache is not None:
+            cache.store_file(*problem, self.output_file, *options)
+        return None
 
 if __name__ == '__main__':
     dimensions, amount_of_pieces, const_pieces = read_input("input.txt")
@@ -0,0 +1,302 @@
+import random
+from math import comb
+from bitboard import BitBoard
+from sparse_board import board_shape
+
+TABLE_SIZE = 1 << 20 # default amount of entries of the transposition table
+REPLACEMENTS = ('always', 'depth', 'two_tier') # policies of the transposition table, see TranspositionTable
+ZOBRIST_SEED = 0x2f1c # keys are the same in every run, so amounts of visited squares can be compared
+PROFILE_STATES = 1 << 17 # largest amount of states of the profile, more of them take hundreds of megabytes
+# largest estimated amount of states visited by count_placements, about ten seconds of counting.
+# Wide boards with few pieces have few states on every square, but so many squares, that the search is faster
+PROFILE_WORK = 1 << 24
+
+class ProfileTooLarge(ValueError):
+    """
+    Raised by count_placements and count_polynomial, when the profile has more than PROFILE_STATES states,
+    and by count_placements, when profile_work is more than PROFILE_WORK
+    """
+
+class TranspositionTable:
+    def __init__(self, size: int = TABLE_SIZE, replacement: str = 'two_tier'):
+        """
+        Initializing class that remembers amounts of placements of sub-problems in a fixed amount of entries.
+        The place of the entry is chosen by the lowest bits of its Zobrist key, so the table never grows.
+        When the place is taken, replacement decides, which entry stays:
+        'always' - the new one, 'depth' - the one, that took more visited squares to count,
+        'two_tier' - every place has two entries, the first is kept by depth, the second is always replaced
+        :param size: Maximum amount of entries, rounded down to a power of two
+        :param replacement: One of REPLACEMENTS
+        """
+        if replacement not in REPLACEMENTS:
+            raise ValueError("Unknown replacement: " + str(replacement))
+        self.replacement = replacement
+        self.ways = 2 if replacement == 'two_tier' else 1 # entries in one place
+        self.size = max(self.ways, 1 << max(size, 1).bit_length() - 1)
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Removes all entries and clears counters
+        :return: None
+        """
+        self.__entries = [None] * self.size # (key, signature, amount, visited squares) or None
+        self.__mask = self.size // self.ways - 1
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replaced = 0 # amount of stored entries, that removed another entry
+
+    def __len__(self) -> int:
+        """
+        :return: Amount of taken entries
+        """
+        return self.size - self.__entries.count(None)
+
+    def lookup(self, key: int, signature: int) -> int | None:
+        """
+        :param key: Zobrist key of the sub-problem
+        :param signature: Exact description of the sub-problem, so different sub-problems with equal keys are not mixed
+        :return: Stored amount or None, if the sub-problem is not stored
+        """
+        place = (key & self.__mask) * self.ways
+        for entry in self.__entries[place:place + self.ways]:
+            if entry is not None and entry[0] == key and entry[1] == signature:
+                self.hits += 1
+                return entry[2]
+        self.misses += 1
+        return None
+
+    def store(self, key: int, signature: int, amount: int, work: int) -> None:
+        """
+        :param key: Zobrist key of the sub-problem
+        :param signature: Exact description of the sub-problem
+        :param amount: Amount of placements of the sub-problem
+        :param work: Amount of squares visited to count it
+        :return: None
+        """
+        entries = self.__entries
+        place = (key & self.__mask) * self.ways
+        old = entries[place]
+        if self.replacement == 'depth' and old is not None and old[3] > work:
+            return None
+        if self.replacement == 'two_tier' and old is not None and old[3] > work:
+            place += 1 # the first entry took more work, the new one goes to the second
+            old = entries[place]
+        if old is not None:
+            self.replaced += 1
+        entries[place] = (key, signature, amount, work)
+        self.stores += 1
+        return None
+
+def board_profile(dimensions, moves: tuple[tuple[int, int], ...]) -> tuple[int, list[int], list[int]]:
+    """
+    Finds, which earlier squares matter for every square in count_placements. It depends only on the board
+    and moves, so it is found once, when many masks are counted
+    :param dimensions: Size of the board or tuple (rows, columns)
+    :param moves: Moves of a piece
+    :return: Tuple with amount of squares, conflicts and relevant bits of the state for every square
+    """
+    rows, columns = board_shape(dimensions)
+    size = rows * columns
+    # before visiting a square, bit k of the state - is there a piece on the square, that was visited k + 1 steps ago.
+    # Pieces, that can not attack any following square, are dropped from the state, so equal futures share one state
+    window = max([dx * columns + dy for dx, dy in moves if dx * columns + dy > 0], default=0)
+    conflicts = [] # conflicts[sq] - bits of the state, pieces on which attack square sq
+    for x in range(rows):
+        for y in range(columns):
+            sq = x * columns + y
+            mask = 0
+            for dx, dy in moves:
+                if 0 <= x - dx < rows and 0 <= y - dy < columns and 0 < dx * columns + dy:
+                    mask |= 1 << (dx * columns + dy - 1)
+            conflicts.append(mask)
+    relevant = [] # relevant[sq] - bits of the state after visiting sq, pieces on which attack following squares
+    for sq in range(size):
+        mask = 0
+        for k in range(min(window, sq + 1)):
+            x, y = divmod(sq - k, columns)
+            for dx, dy in moves:
+                if 0 <= x + dx < rows and 0 <= y + dy < columns and (x + dx) * columns + y + dy > sq:
+                    mask |= 1 << k
+                    break
+        relevant.append(mask)
+    return size, conflicts, relevant
+
+def profile_work(dimensions, moves: tuple[tuple[int, int], ...], amount: int) -> int:
+    """
+    Estimates work of count_placements before the profile is built. The state keeps pieces of the last squares
+    within the reach of moves, so there are not more states than placements of up to amount pieces there
+    :param dimensions: Size of the board or tuple (rows, columns)
+    :param moves: Moves of a piece
+    :param amount: Amount of pieces that needs to be placed
+    :return: Upper bound of amount of states visited on the empty board
+    """
+    rows, columns = board_shape(dimensions)
+    window = max([dx * columns + dy for dx, dy in moves if dx * columns + dy > 0], default=0)
+    states = 0
+    for k in range(min(amount, window) + 1):
+        states += comb(window, k)
+        if states > PROFILE_STATES:
+            break
+    return min(states, PROFILE_STATES) * rows * columns
+
+def _count_profile(profile: tuple, free: int, amount: int, exact: bool) -> list[int]:
+    """
+    Dynamic programming over the board profile. Squares before the first free one and after the last one
+    do not change amounts, so only squares between them are visited
+    :param profile: Result of board_profile
+    :param free: Mask of free squares
+    :param amount: The largest amount of pieces
+    :param exact: if True, only the amount for amount pieces is right, placements with less pieces are dropped,
+    as soon as they can not be completed
+    :return: Amounts of placements of 0, 1, ..., amount pieces
+    """
+    size, conflicts, relevant = profile
+    first = (free & -free).bit_length() - 1 if free else 0
+    stop = free.bit_length()
+    left = [0] * (stop + 1) # left[sq] - amount of free squares from sq to the end of the board
+    for sq in range(stop - 1, first - 1, -1):
+        left[sq] = left[sq + 1] + (free >> sq & 1)
+    if exact and left[first] < amount:
+        return [0] * (amount + 1)
+
+    # amounts of placements with 0, 1, ..., amount pieces are packed into one integer, bits bits per amount,
+    # so adding them up and placing one more piece (shifting by bits) take one operation on a whole state
+    bits = left[first] + 1 # amount of placements never exceeds 2 ** (amount of free squares)
+    limit = (1 << bits * (amount + 1)) - 1
+    states = {0: 1} # state: packed amounts of placements
+    for sq in range(first, stop):
+        conflict = conflicts[sq]
+        keep = relevant[sq]
+        new_states = {}
+        if free >> sq & 1:
+            # placements with less than need pieces can not be completed on the rest of the board
+            need = amount - left[sq + 1] if exact else 0
+            drop = (1 << bits * need) - 1 if need > 0 else 0
+            for state, ways in states.items():
+                shifted = (state << 1) & keep
+                new_states[shifted] = new_states.get(shifted, 0) + (ways & ~drop)
+                if not state & conflict:
+                    placed = (ways << bits) & limit
+                    if placed:
+                        key = (state << 1 | 1) & keep
+                        new_states[key] = new_states.get(key, 0) + placed
+        else:
+            for state, ways in states.items():
+                shifted = (state << 1) & keep
+                new_states[shifted] = new_states.get(shifted, 0) + ways
+        states = {state: ways for state, ways in new_states.items() if ways}
+        if len(states) > PROFILE_STATES:
+            raise ProfileTooLarge("Profile has more than " + str(PROFILE_STATES) + " states")
+    total = sum(states.values())
+    return [total >> bits * k & (1 << bits) - 1 for k in range(amount + 1)]
+
+def count_placements(dimensions, moves: tuple[tuple[int, int], ...], free: int, amount: int,
+                     profile: tuple | None = None) -> int:
+    """
+    Counts placements of pieces on free squares with dynamic programming over the board profile.
+    Squares are visited in row-major order and the state keeps only the occupancy of the last squares,
+    that can still attack following ones, so running time does not depend on amount of solutions.
+    :param dimensions: Size of the board or tuple (rows, columns)
+    :param moves: Moves of a piece
+    :param free: Mask of free squares (bit x * columns + y stands for square (x, y))
+    :param amount: Amount of pieces that needs to be placed
+    :param profile: Result of board_profile for the same board and moves. None - it is found
+    :return: Amount of placements, the same as amount of solutions ChessSolver enumerates.
+    Raises ProfileTooLarge, when the profile has more than PROFILE_STATES states or profile_work is more
+    than PROFILE_WORK
+    """
+    rows, columns = board_shape(dimensions)
+    if amount > rows * columns:
+        return 0
+    if profile_work(dimensions, moves, amount) > PROFILE_WORK:
+        raise ProfileTooLarge("Profile needs more than " + str(PROFILE_WORK) + " states")
+    return _count_profile(profile or board_profile(dimensions, moves), free, amount, True)[amount]
+
+def count_polynomial(dimensions, moves: tuple[tuple[int, int], ...], free: int, amount: int,
+                     profile: tuple | None = None) -> list[int]:
+    """
+    Counts placements of every amount of pieces at once, the same way as count_placements
+    :param dimensions: Size of the board or tuple (rows, columns)
+    :param moves: Moves of a piece
+    :param free: Mask of free squares
+    :param amount: The largest amount of pieces
+    :param profile: Result of board_profile for the same board and moves. None - it is found
+    :return: List, item k of which is amount of placements of k pieces, for k from 0 to amount
+    """
+    return _count_profile(profile or board_profile(dimensions, moves), free, amount, False)
+
+def count_transpositions(bitboard: BitBoard, free: int, amount: int, table: TranspositionTable | None = None) -> int:
+    """
+    Counts placements of pieces on free squares with depth-first search, that remembers amounts of sub-problems.
+    Sub-problem is the mask of squares still available and amount of pieces left. Squares farther than the reach
+    of moves from the first available square are not touched by placed pieces, so they are the same as in free,
+    and the signature keeps only the first available square and the available squares within the reach.
+    Zobrist key of the sub-problem is updated by xor with keys of squares, that leave the mask,
+    so it is not recomputed from the whole mask. Unlike count_placements memory does not grow over the table size
+    :param bitboard: Instance of BitBoard
+    :param free: Mask of free squares
+    :param amount: Amount of pieces that needs to be placed
+    :param table: Transposition table, it is cleared before counting. None - table of TABLE_SIZE entries is used
+    :return: Amount of placements, the same as count_placements
+    """
+    if table is None:
+        table = TranspositionTable()
+    else:
+        table.clear()
+    if amount == 0:
+        return 1
+    keep = bitboard.keep
+    attacks = bitboard.attacks
+    capacity = bitboard.capacity
+    size = bitboard.size
+    generator = random.Random(ZOBRIST_SEED)
+    squares = [generator.getrandbits(64) for _ in range(size)] # Zobrist keys of available squares
+    lefts = [generator.getrandbits(64) for _ in range(amount + 1)] # Zobrist keys of amounts of pieces left
+    reach = max([(mask >> sq + 1).bit_length() for sq, mask in enumerate(attacks)], default=0)
+    frontier = (1 << reach) - 1
+    visited = 0
+
+    def count(avail: int, key: int, left: int) -> int:
+        nonlocal visited
+        if left == 0:
+            return 1
+        if left == 1:
+            return avail.bit_count()
+        if avail.bit_count() < left or capacity(avail) < left:
+            return 0
+        first = (avail & -avail).bit_length() - 1
+        signature = ((avail >> first & frontier) * (amount + 1) + left) * size + first
+        found = table.lookup(key, signature)
+        if found is not None:
+            return found
+        start = visited
+        total = 0
+        rest = avail
+        rest_key = key ^ lefts[left] ^ lefts[left - 1]
+        while rest:
+            low = rest & -rest
+            sq = low.bit_length() - 1
+            rest ^= low
+            rest_key ^= squares[sq]
+            if rest.bit_count() < left - 1:
+                break
+            visited += 1
+            child_key = rest_key
+            removed = rest & attacks[sq]
+            while removed:
+                bit = removed & -removed
+                removed ^= bit
+                child_key ^= squares[bit.bit_length() - 1]
+            total += count(rest & keep[sq], child_key, left - 1)
+        table.store(key, signature, total, visited - start)
+        return total
+
+    key = lefts[amount]
+    rest = free
+    while rest:
+        bit = rest & -rest
+        rest ^= bit
+        key ^= squares[bit.bit_length() - 1]
+    return count(free, key, amount)
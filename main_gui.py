@@ -7,16 +7,21 @@ from PySide6.QtWidgets import (
     QLabel,
     QLineEdit,
     QMainWindow,
-    QDialog
+    QDialog,
+    QMessageBox
 )
-from PySide6.QtCore import QSize, Qt
+from PySide6.QtCore import QSize, Qt, QThreadPool
 from PySide6.QtGui import QIntValidator
 from chess import ChessSolver
+from board_model import BoardModel
 from place_pieces_dialog import PlacePiecesWidget
 from show_board_dialog import ShowBoardWidget
+from progress_dialog import ProgressWidget
+from workers import SolveWorker
 import sys
 
 MAIN_WINDOW_SIZE = QSize(300, 200)
+MAX_BOARD_SIZE = 256 # boards larger than TILE_ITEMS_LIMIT are painted by one item
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -30,16 +35,14 @@ class MainWindow(QMainWindow):
         self.amount: int
         self.amount_lck = True
 
-        self.chess: ChessSolver
-        self.placed_pieces = []
-        self.tiles_under_attack = []
+        self.model: BoardModel # board shared by the solver and all windows
 
         self.setWindowTitle("ThinkChess")
 
         # set window size
         self.setFixedSize(MAIN_WINDOW_SIZE)
 
-        validator = QIntValidator(1, 20, self)
+        validator = QIntValidator(1, MAX_BOARD_SIZE, self)
         # size of the board
         self.size_label = QLabel("Input size of the board:")
         self.size_input = QLineEdit()
@@ -51,7 +54,7 @@ class MainWindow(QMainWindow):
         layout_size.addWidget(self.size_input)
 
         # amount of pieces
-        validator2 = QIntValidator(1, 20*20, self)
+        validator2 = QIntValidator(1, MAX_BOARD_SIZE*MAX_BOARD_SIZE, self)
         self.amount_label = QLabel("Input amount of pieces")
         self.amount_input = QLineEdit()
         self.amount_input.textEdited.connect(self.amount_inputed)
@@ -89,6 +92,8 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(widget)
 
+        self.threadpool = QThreadPool()
+
     def size_inputed(self, text: str):
         """
         Called upon size text editing.
@@ -99,12 +104,11 @@ class MainWindow(QMainWindow):
             self.board_size_lck = True
         else:
             num = int(text)
-            if num > 20 or num < 1:
+            if num > MAX_BOARD_SIZE or num < 1:
                 self.board_size_lck = True
             else:
                 self.board_size = num
-                self.chess = ChessSolver(self.board_size)
-                self.placed_pieces = []
+                self.model = BoardModel(ChessSolver(self.board_size))
                 self.board_size_lck = False
         self.__unblock_bts()
 
@@ -118,7 +122,7 @@ class MainWindow(QMainWindow):
             self.amount_lck = True
         else:
             numb = int(text)
-            if numb > 20 * 20 or numb < 1:
+            if numb > MAX_BOARD_SIZE * MAX_BOARD_SIZE or numb < 1:
                 self.amount_lck = True
             else:
                 self.amount = numb
@@ -133,7 +137,6 @@ class MainWindow(QMainWindow):
         if not self.board_size_lck and not self.amount_lck:
             self.place_pieces_bt.setDisabled(False)
             self.show_board_bt.setDisabled(False)
-            self.chess = ChessSolver(self.board_size)
         else:
             self.place_pieces_bt.setDisabled(True)
             self.show_board_bt.setDisabled(True)
@@ -148,14 +151,19 @@ class MainWindow(QMainWindow):
 
     def show_board_bt_clicked(self):
         """
-        Called upon show board button clicked. Creates a window, where user can see board with first solution.
+        Called upon show board button clicked. Searches first solution in other thread, while window with progress
+        is shown. Creates a window, where user can see board with first solution.
         Creates a window with text: "No solution found" if no solution has been found.
         :return: None
         """
-        solution = self.chess.compute(self.amount, 1)
-        self.chess = ChessSolver(self.board_size)
-        for i in self.placed_pieces:
-            self.chess.place_piece(i[0],  i[1])
+        worker = SolveWorker(self.model.chess, self.amount)
+        progress = ProgressWidget(self, worker)
+        self.threadpool.start(worker)
+        if progress.exec() != QDialog.DialogCode.Accepted: # cancelled by user or failed
+            if progress.error is not None:
+                QMessageBox.critical(self, "Error", progress.error)
+            return None
+        solution = progress.result
         if not solution:
             dlg = QDialog()
             dlg.setFixedSize(200, 70)
@@ -169,7 +177,7 @@ class MainWindow(QMainWindow):
             dlg.setLayout(layout)
             dlg.exec()
         else:
-            wdg = ShowBoardWidget(self)
+            wdg = ShowBoardWidget(self, solution)
             wdg.exec()
 
 if __name__ == '__main__':
@@ -0,0 +1,105 @@
+try:
+    import numpy as np
+except ImportError: # numpy is optional, only boards created with numpy_board=True need it
+    np = None
+from sparse_board import board_shape, is_sparse_board
+
+def require_numpy() -> None:
+    """
+    :return: None, raises ImportError if numpy is not installed
+    """
+    if np is None:
+        raise ImportError("numpy is required for boards created with numpy_board=True")
+
+def is_numpy_board(board) -> bool:
+    """
+    :param board: Two-dimensional list or array
+    :return: True if board is numpy array
+    """
+    return np is not None and isinstance(board, np.ndarray)
+
+def create_numpy_board(dimensions):
+    """
+    :param dimensions: Size of the board or tuple (rows, columns)
+    :return: Array of int8 zeros, values have the same meaning as in two-dimensional list
+    """
+    require_numpy()
+    return np.zeros(board_shape(dimensions), dtype=np.int8)
+
+def _targets(dimensions, moves: tuple[tuple[int, int], ...], squares):
+    """
+    :param dimensions: Size of the board or tuple (rows, columns)
+    :param moves: Moves of a piece
+    :param squares: Array of coordinates of pieces with the last axis of size 2
+    :return: Array of numbers of attacked squares with one more axis for moves, -1 for moves out of the board
+    """
+    shape = np.asarray(board_shape(dimensions), dtype=np.int64)
+    offsets = np.asarray(moves, dtype=np.int64).reshape(-1, 2)
+    targets = squares[..., None, :] + offsets
+    inside = ((targets >= 0) & (targets < shape)).all(axis=-1)
+    return np.where(inside, targets[..., 0] * shape[1] + targets[..., 1], -1)
+
+def place_numpy_pieces(board, moves: tuple[tuple[int, int], ...], pieces) -> bool:
+    """
+    Places a batch of pieces with one scatter-add of their moves. The result is the same as placing them
+    one by one, so pieces are placed only if every piece stands on a free square, that is not attacked
+    by pieces placed before it.
+    :param board: Array created by create_numpy_board
+    :param moves: Moves of a piece
+    :param pieces: Coordinates of pieces in the order they are placed
+    :return: True if pieces were placed, False if board was not changed and pieces must be placed one by one
+    """
+    rows, columns = board.shape
+    squares = np.asarray(pieces, dtype=np.int64).reshape(-1, 2)
+    if not len(squares) or ((squares < 0) | (squares >= board.shape)).any():
+        return False
+    numbers = squares[:, 0] * columns + squares[:, 1]
+    flat = board.reshape(-1)
+    if (flat[numbers] != 0).any() or len(np.unique(numbers)) != len(numbers):
+        return False
+    targets = _targets(board.shape, moves, squares)
+    order = np.full(rows * columns, -1, dtype=np.int64) # order[sq] - number of the piece standing on sq
+    order[numbers] = np.arange(len(numbers))
+    attacker = np.broadcast_to(np.arange(len(numbers))[:, None], targets.shape)
+    attacked = np.where(targets >= 0, order[targets], -1)
+    if (attacked > attacker).any(): # a piece would stand on a square attacked by an earlier one
+        return False
+    flat[numbers] = -1
+    np.add.at(flat, targets[targets >= 0], 1)
+    return True
+
+def non_attacking(dimensions, moves: tuple[tuple[int, int], ...], candidates, board=None):
+    """
+    Checks many candidate placements at once
+    :param dimensions: Size of the board or tuple (rows, columns)
+    :param moves: Moves of a piece
+    :param candidates: Array-like of shape (amount of candidates, pieces in candidate, 2) with coordinates
+    :param board: if given, every piece must also stand on a square, that is 0 on the board. It can be SparseBoard
+    :return: Array of bools, True for candidates with pieces on different squares, that do not attack each other
+    """
+    require_numpy()
+    squares = np.asarray(candidates, dtype=np.int64)
+    squares = squares.reshape(len(squares), -1, 2) if squares.size else np.zeros((len(squares), 0, 2), np.int64)
+    rows, columns = board_shape(dimensions)
+    valid = ((squares >= 0) & (squares < (rows, columns))).all(axis=(1, 2))
+    numbers = np.where(valid[:, None], squares[..., 0] * columns + squares[..., 1], 0)
+    targets = _targets(dimensions, moves, squares)
+    targets = targets.reshape(len(targets), -1 if targets.size else 0) # candidates, pieces * moves
+    ordered = np.sort(numbers, axis=1)
+    repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+    # squares of every candidate are shifted by its own multiple of the board size, so sorted squares of all
+    # candidates are one sorted array, and attacked squares are looked up there without pieces * pieces comparisons
+    shift = np.arange(len(numbers), dtype=np.int64)[:, None] * (rows * columns)
+    placed = (ordered + shift).reshape(-1)
+    hits = np.zeros(len(numbers), dtype=bool)
+    if placed.size:
+        query = targets + shift
+        found = placed[np.minimum(np.searchsorted(placed, query), placed.size - 1)]
+        hits = ((found == query) & (targets >= 0)).any(axis=1)
+    valid &= ~hits & ~repeated
+    if is_sparse_board(board):
+        get = board.values.get
+        valid &= np.array([not any(get(sq, 0) for sq in row.tolist()) for row in numbers], dtype=bool)
+    elif board is not None:
+        valid &= (np.asarray(board).reshape(-1)[numbers] == 0).all(axis=1)
+    return valid
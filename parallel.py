@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+from multiprocessing import Pool
+from bitboard import BitBoard
+
+_bitboard: BitBoard # bitboard of the worker process, set by _init_worker
+_labels: list[str]
+
+def _init_worker(bitboard: BitBoard) -> None:
+    """
+    Called once in every worker process. Stores bitboard, so it is not sent with every task.
+    :param bitboard: Instance of BitBoard
+    :return: None
+    """
+    global _bitboard, _labels
+    _bitboard = bitboard
+    _labels = [str(bitboard.coordinates(sq)) + " " for sq in range(bitboard.size)]
+
+def _write_shard(task: tuple) -> str:
+    """
+    Called in worker process. Writes all solutions of a group of subtrees to the shard file.
+    :param task: Tuple with list of (prefix, free squares after prefix), amount of pieces left, beginning of every line
+    and path of the shard file
+    :return: Path of the shard file
+    """
+    subtrees, amount, head, path = task
+    with open(path, 'w') as f:
+        for prefix, free in subtrees:
+            line_head = head + "".join([_labels[sq] for sq in prefix])
+            for solution in _bitboard.solutions(free, amount):
+                f.write(line_head + "".join([_labels[sq] for sq in solution]) + '\n')
+    return path
+
+def write_parallel(f, bitboard: BitBoard, free: int, amount: int, head: str, processes: int,
+                   split_depth: int = 1, directory: str | None = None) -> None:
+    """
+    Splits search tree by first split_depth placed pieces and writes solutions of subtrees in worker processes.
+    Shards are merged into f in the same order, as sequential algorithm writes solutions.
+    :param f: Opened output file
+    :param bitboard: Instance of BitBoard
+    :param free: Mask of free squares
+    :param amount: Amount of pieces that needs to be placed
+    :param head: Beginning of every line (already placed pieces)
+    :param processes: Amount of worker processes
+    :param split_depth: Amount of first placed pieces, that define a subtree
+    :param directory: Directory of shards. None - directory of f
+    :return: None
+    """
+    split_depth = max(1, min(split_depth, amount))
+    subtrees = [(prefix, bitboard.after(free, prefix)) for prefix in bitboard.shards(free, amount, split_depth)]
+    if not subtrees:
+        return None
+    # many small groups keep all processes busy, since first subtrees are much larger than last ones
+    size = max(1, len(subtrees) // (processes * 8))
+    if directory is None:
+        directory = os.path.dirname(os.path.abspath(f.name))
+    shard_dir = tempfile.mkdtemp(prefix='shards_', dir=directory)
+    tasks = [(subtrees[i:i + size], amount - split_depth, head, os.path.join(shard_dir, str(i)))
+             for i in range(0, len(subtrees), size)]
+    f.flush()
+    try:
+        with Pool(processes, initializer=_init_worker, initargs=(bitboard,)) as pool:
+            for path in pool.imap(_write_shard, tasks):
+                with open(path, 'r') as shard:
+                    shutil.copyfileobj(shard, f)
+                os.remove(path)
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+    return None
@@ -0,0 +1,95 @@
+from PySide6.QtWidgets import QPushButton, QDialog, QVBoxLayout, QLabel
+from workers import SolveWorker
+
+class ProgressWidget(QDialog):
+    def __init__(self, parent, worker: SolveWorker, title: str = "Solving"):
+        """
+        Initializing window, that shows progress of the worker and lets user cancel it.
+        Window is accepted, when worker finishes, and rejected, when user cancels it or worker fails.
+        Text of the error of the worker is kept in error, so the caller can show it.
+        Cancelled window stays open, until the worker stops, so the solver and the file are not used by two searches.
+        :param parent: Parent class
+        :param worker: Worker, that is not started yet
+        :param title: Title of the window
+        """
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setFixedSize(250, 130)
+        self.worker = worker
+        self.result = None
+        self.error = None # text of the error of the worker
+        self.cancelling = False
+
+        self.nodes_label = QLabel("Squares visited: 0")
+        self.solutions_label = QLabel("Solutions found: 0")
+        self.time_label = QLabel("Elapsed time: 0.0 s")
+
+        self.cancel_bt = QPushButton("Cancel")
+        self.cancel_bt.clicked.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.nodes_label)
+        layout.addWidget(self.solutions_label)
+        layout.addWidget(self.time_label)
+        layout.addWidget(self.cancel_bt)
+        self.setLayout(layout)
+
+        worker.signals.progress.connect(self.progress_changed)
+        worker.signals.finished.connect(self.worker_finished)
+        worker.signals.cancelled.connect(self.worker_stopped)
+        worker.signals.failed.connect(self.worker_failed)
+
+    def progress_changed(self, nodes: int, solutions: int, elapsed: float):
+        """
+        Called upon worker reporting progress.
+        :param nodes: Amount of visited squares
+        :param solutions: Amount of found solutions
+        :param elapsed: Elapsed seconds
+        :return: None
+        """
+        self.nodes_label.setText(f"Squares visited: {nodes}")
+        self.solutions_label.setText(f"Solutions found: {solutions}")
+        self.time_label.setText(f"Elapsed time: {elapsed:.1f} s")
+
+    def worker_finished(self, result):
+        """
+        Called upon worker finishing. Keeps the result and closes the window.
+        :param result: Result of ChessSolver.compute
+        :return: None
+        """
+        if self.cancelling: # search was over before it saw the cancel
+            super().reject()
+            return None
+        self.result = result
+        self.accept()
+        return None
+
+    def worker_stopped(self):
+        """
+        Called upon worker stopping after cancel. Closes the window.
+        :return: None
+        """
+        super().reject()
+
+    def worker_failed(self, error: str):
+        """
+        Called upon worker stopping because of an error. Keeps the error and closes the window.
+        :param error: Text of the error
+        :return: None
+        """
+        self.error = error
+        super().reject()
+
+    def reject(self):
+        """
+        Called upon user clicking cancel button or closing the window. Asks the worker to stop,
+        the window is closed by worker_stopped.
+        :return: None
+        """
+        if self.cancelling:
+            return None
+        self.cancelling = True
+        self.cancel_bt.setDisabled(True)
+        self.cancel_bt.setText("Cancelling...")
+        self.worker.cancel()
+        return None
@@ -0,0 +1,52 @@
+from sparse_board import board_shape
+
+# directions of pieces, that move any amount of squares along a line
+ROOK = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+QUEEN = ROOK + BISHOP
+NIGHTRIDER = ((1, 2), (2, 1), (-1, 2), (-2, 1), (1, -2), (2, -1), (-1, -2), (-2, -1))
+
+def ray_moves(directions: tuple[tuple[int, int], ...], dimensions) -> tuple[tuple[int, int], ...]:
+    """
+    Converts directions of rays into moves, that reach every square of the ray on the board of that size
+    :param directions: Steps (dx, dy) of rays
+    :param dimensions: Size of the board or tuple (rows, columns)
+    :return: Moves (k * dx, k * dy) of every direction, nearest squares first
+    """
+    rows, columns = board_shape(dimensions)
+    moves = []
+    for dx, dy in directions:
+        if dx == 0 and dy == 0:
+            raise ValueError("Ray without direction: " + str((dx, dy)))
+        k = 1
+        while abs(k * dx) < rows and abs(k * dy) < columns:
+            moves.append((k * dx, k * dy))
+            k += 1
+    return tuple(moves)
+
+def split_rays(moves: tuple[tuple[int, int], ...], dimensions) -> tuple[tuple, tuple]:
+    """
+    Finds rays among moves, so that rays given as long lists of moves are also stored as ray masks.
+    Direction is a ray, when moves have every step of it, that fits on the board, and it makes more than one step
+    :param moves: Moves of a piece
+    :param dimensions: Size of the board or tuple (rows, columns)
+    :return: Moves, that are not parts of rays, in the same order, and directions of rays
+    """
+    left = set(moves)
+    directions = []
+    for dx, dy in sorted(left, key=lambda move: (max(abs(move[0]), abs(move[1])), move)):
+        if (dx, dy) not in left or dx == dy == 0:
+            continue
+        ray = ray_moves(((dx, dy),), dimensions)
+        if len(ray) > 1 and left.issuperset(ray):
+            directions.append((dx, dy))
+            left.difference_update(ray)
+    return tuple(move for move in moves if move in left), tuple(directions)
+
+def opposite_missing(directions: tuple[tuple[int, int], ...]) -> list[tuple[int, int]]:
+    """
+    :param directions: Steps (dx, dy) of rays
+    :return: Directions, that have no ray in the opposite direction
+    """
+    present = set(directions)
+    return [(dx, dy) for dx, dy in directions if (-dx, -dy) not in present]
@@ -0,0 +1,118 @@
+from bitboard import BitBoard
+from counting import board_profile, count_polynomial
+
+def components(bitboard: BitBoard, free: int) -> list[int]:
+    """
+    Splits free squares into regions, pieces in which can not attack pieces in other regions.
+    Two free squares are joined, when a piece on one of them attacks the other one
+    :param bitboard: Instance of BitBoard
+    :param free: Mask of free squares
+    :return: Masks of regions in order of their first squares
+    """
+    conflicts = bitboard.conflicts
+    regions = []
+    while free:
+        region = new = free & -free
+        while new:
+            reached = 0
+            while new:
+                bit = new & -new
+                new ^= bit
+                reached |= conflicts[bit.bit_length() - 1]
+            new = reached & free & ~region
+            region |= new
+        regions.append(region)
+        free &= ~region
+    return regions
+
+def convolve(first: list[int], second: list[int], limit: int) -> list[int]:
+    """
+    Multiplies polynomials, which coefficients are amounts of placements of k pieces
+    :param first: Coefficients of the first polynomial
+    :param second: Coefficients of the second polynomial
+    :param limit: The largest power, that is kept
+    :return: Coefficients of the product up to limit
+    """
+    result = [0] * min(limit + 1, len(first) + len(second) - 1)
+    for i, a in enumerate(first[:limit + 1]):
+        if a:
+            for j, b in enumerate(second[:limit + 1 - i]):
+                result[i + j] += a * b
+    return result
+
+class Regions:
+    def __init__(self, bitboard: BitBoard, moves: tuple[tuple[int, int], ...], free: int, amount: int):
+        """
+        Initializing class that solves every region of free squares separately. Amounts of placements of every
+        region are counted for every amount of pieces and combined by convolution, so the work is the sum
+        over regions instead of the product
+        :param bitboard: Instance of BitBoard
+        :param moves: Moves of a piece
+        :param free: Mask of free squares
+        :param amount: The largest amount of pieces, that is counted or enumerated
+        """
+        self.bitboard = bitboard
+        self.amount = amount
+        self.regions = components(bitboard, free)
+        profile = board_profile(bitboard.dimensions, moves)
+        # polynomials[i][k] - amount of placements of k pieces in region i
+        self.polynomials = [count_polynomial(bitboard.dimensions, moves, region, min(amount, region.bit_count()),
+                                             profile) for region in self.regions]
+        # suffixes[i][k] - amount of placements of k pieces in regions from i to the last one
+        self.suffixes = [[1]]
+        for polynomial in reversed(self.polynomials):
+            self.suffixes.append(convolve(polynomial, self.suffixes[-1], amount))
+        self.suffixes.reverse()
+
+    def count(self, amount: int) -> int:
+        """
+        :param amount: Amount of pieces, not greater than amount given at initialization
+        :return: Amount of placements of pieces on free squares
+        """
+        total = self.suffixes[0]
+        return total[amount] if amount < len(total) else 0
+
+    def __choices(self, index: int, left: int):
+        """
+        :param index: Number of the region
+        :param left: Amount of pieces, that is placed in this region and the following ones
+        :return: Generator of (amount of pieces, placement) in the region, that can be completed by following regions
+        """
+        polynomial = self.polynomials[index]
+        following = self.suffixes[index + 1]
+        for k in range(min(left, len(polynomial) - 1) + 1):
+            if polynomial[k] and left - k < len(following) and following[left - k]:
+                for placement in self.bitboard.solutions(self.regions[index], k):
+                    yield k, placement
+
+    def solutions(self, amount: int):
+        """
+        Lazily yields placements as Cartesian product of placements of regions. Only placements of regions,
+        that can be completed, are searched, so every yielded tuple is a solution. Solutions are grouped
+        by amounts of pieces in regions, not in lexicographic order
+        :param amount: Amount of pieces, not greater than amount given at initialization
+        :return: Generator of increasing tuples with numbers of squares of placed pieces
+        """
+        if not self.count(amount):
+            return
+        if not self.regions:
+            yield ()
+            return
+        last = len(self.regions) - 1
+        stack = [self.__choices(0, amount)] # stack[i] - choices of region i
+        lefts = [amount] # lefts[i] - pieces left for region i and following ones
+        chosen = []
+        while stack:
+            index = len(stack) - 1
+            choice = next(stack[index], None)
+            del chosen[index:]
+            if choice is None:
+                stack.pop()
+                lefts.pop()
+                continue
+            chosen.append(choice[1])
+            if index == last:
+                yield tuple(sorted([sq for placement in chosen for sq in placement]))
+            else:
+                lefts.append(lefts[index] - choice[0])
+                stack.append(self.__choices(index + 1, lefts[-1]))
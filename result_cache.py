@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from symmetry import TRANSFORMATIONS, transformations
+from sparse_board import board_shape
+
+class ResultCache:
+    def __init__(self, filename: str = 'results.sqlite', max_size: int = 1 << 28, max_file_size: int = 1 << 24):
+        """
+        Initializing class that keeps results of solved problems in SQLite database.
+        First solutions and amounts of solutions are shared between problems, that differ by rotation or reflection
+        of already placed pieces. Files with all solutions are kept only for exactly the same problem.
+        When the database grows over max_size, least recently used results are removed.
+        :param filename: Name of the database file
+        :param max_size: Maximum size of stored results in bytes
+        :param max_file_size: Maximum size of the file with all solutions, that is stored. 0 - files are not stored
+        """
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock() # connection is shared with worker threads of the GUI
+        self.__db = sqlite3.connect(filename, check_same_thread=False)
+        self.__db.execute("CREATE TABLE IF NOT EXISTS results "
+                          "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)")
+        self.__db.commit()
+
+    @staticmethod
+    def __transforms(dimensions, moves: tuple[tuple[int, int], ...]) -> list:
+        """
+        :param dimensions: Size of the board
+        :param moves: Moves of a piece
+        :return: Rotations and reflections of the board, that map moves to the same moves
+        """
+        shape = board_shape(dimensions)
+        transforms = []
+        for transform in transformations(*shape):
+            x0, y0 = transform(0, 0, *shape)
+            moved = set()
+            for dx, dy in moves:
+                x, y = transform(dx, dy, *shape)
+                moved.add((x - x0, y - y0))
+            if moved == set(moves):
+                transforms.append(transform)
+        return transforms
+
+    @staticmethod
+    def __inverse(transform, dimensions):
+        """
+        :param transform: Rotation or reflection of the board
+        :param dimensions: Size of the board
+        :return: Rotation or reflection, that moves squares back
+        """
+        shape = board_shape(dimensions)
+        for inverse in TRANSFORMATIONS:
+            if all(inverse(*transform(x, y, *shape), *shape) == (x, y) for x, y in ((0, 0), (0, 1), (1, 0))):
+                return inverse
+
+    def __normalize(self, dimensions: int, moves: tuple[tuple[int, int], ...], pieces: list[tuple[int, int], ]):
+        """
+        Finds the smallest image of already placed pieces
+        :param dimensions: Size of the board
+        :param moves: Moves of a piece
+        :param pieces: Coordinates of already placed pieces
+        :return: Transformation, that gives the smallest image, and the image
+        """
+        shape = board_shape(dimensions)
+        best = None
+        for transform in self.__transforms(dimensions, moves):
+            image = sorted(transform(x, y, *shape) for x, y in pieces)
+            if best is None or image < best[1]:
+                best = (transform, image)
+        return best
+
+    @staticmethod
+    def __key(*parts) -> str:
+        """
+        :param parts: JSON serializable parts of the problem
+        :return: Hash of the problem
+        """
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def __get(self, key: str) -> bytes | None:
+        """
+        :param key: Hash of the problem
+        :return: Stored value or None, if there is no such value
+        """
+        with self.__lock:
+            row = self.__db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+            self.__db.commit()
+            return row[0]
+
+    def __put(self, key: str, value: bytes) -> None:
+        """
+        Stores value and removes least recently used values, until all values fit into max_size
+        :param key: Hash of the problem
+        :param value: Value
+        :return: None
+        """
+        if len(value) > self.max_size:
+            return None
+        with self.__lock:
+            self.__db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, value, len(value), time.time()))
+            total = self.__db.execute("SELECT SUM(size) FROM results").fetchone()[0]
+            for old_key, size in self.__db.execute("SELECT key, size FROM results ORDER BY used").fetchall():
+                if total <= self.max_size:
+                    break
+                self.__db.execute("DELETE FROM results WHERE key = ?", (old_key,))
+                total -= size
+            self.__db.commit()
+        return None
+
+    def lookup_first(self, dimensions: int, moves: tuple[tuple[int, int], ...], pieces: list[tuple[int, int], ],
+                     amount: int) -> list | None:
+        """
+        :param dimensions: Size of the board
+        :param moves: Moves of a piece
+        :param pieces: Coordinates of already placed pieces
+        :param amount: Amount of pieces that needs to be placed
+        :return: None if problem is not stored, otherwise first solution as ChessSolver.compute returns it
+        """
+        transform, image = self.__normalize(dimensions, moves, pieces)
+        value = self.__get(self.__key('first', dimensions, sorted(moves), image, amount))
+        if value is None:
+            return None
+        placed = json.loads(value)
+        if placed is None:
+            return []
+        inverse = self.__inverse(transform, dimensions)
+        return list(pieces) + sorted(inverse(x, y, *board_shape(dimensions)) for x, y in placed)
+
+    def store_first(self, dimensions: int, moves: tuple[tuple[int, int], ...], pieces: list[tuple[int, int], ],
+                    amount: int, solution: list) -> None:
+        """
+        :param dimensions: Size of the board
+        :param moves: Moves of a piece
+        :param pieces: Coordinates of already placed pieces
+        :param amount: Amount of pieces that needs to be placed
+        :param solution: First solution as ChessSolver.compute returns it, empty list if there is no solution
+        :return: None
+        """
+        transform, image = self.__normalize(dimensions, moves, pieces)
+        placed = sorted(transform(x, y, *board_shape(dimensions)) for x, y in solution[len(pieces):]) if solution else None
+        self.__put(self.__key('first', dimensions, sorted(moves), image, amount), json.dumps(placed).encode())
+
+    def lookup_count(self, dimensions: int, moves: tuple[tuple[int, int], ...], pieces: list[tuple[int, int], ],
+                     amount: int) -> int | None:
+        """
+        :param dimensions: Size of the board
+        :param moves: Moves of a piece
+        :param pieces: Coordinates of already placed pieces
+        :param amount: Amount of pieces that needs to be placed
+        :return: None if problem is not stored, otherwise amount of solutions
+        """
+        value = self.__get(self.__key('count', dimensions, sorted(moves), self.__normalize(dimensions, moves, pieces)[1],
+                                      amount))
+        return None if value is None else int(value)
+
+    def store_count(self, dimensions: int, moves: tuple[tuple[int, int], ...], pieces: list[tuple[int, int], ],
+                    amount: int, count: int) -> None:
+        """
+        :param dimensions: Size of the board
+        :param moves: Moves of a piece
+        :param pieces: Coordinates of already placed pieces
+        :param amount: Amount of pieces that needs to be placed
+        :param count: Amount of solutions
+        :return: None
+        """
+        self.__put(self.__key('count', dimensions, sorted(moves), self.__normalize(dimensions, moves, pieces)[1], amount),
+                   str(count).encode())
+
+    def lookup_file(self, dimensions: int, moves: tuple[tuple[int, int], ...], pieces: list[tuple[int, int], ],
+                    amount: int, *options) -> bytes | None:
+        """
+        :param dimensions: Size of the board
+        :param moves: Moves of a piece
+        :param pieces: Coordinates of already placed pieces in the order they were placed
+        :param amount: Amount of pieces that needs to be placed
+        :param options: Options of ChessSolver.compute, that change contents of the file
+        :return: None if problem is not stored, otherwise contents of the file with all solutions
+        """
+        value = self.__get(self.__key('file', dimensions, list(moves), list(pieces), amount, *options))
+        return None if value is None else zlib.decompress(value)
+
+    def store_file(self, dimensions: int, moves: tuple[tuple[int, int], ...], pieces: list[tuple[int, int], ],
+                   amount: int, filename: str, *options) -> None:
+        """
+        Stores the file with all solutions, if it is not larger than max_file_size
+        :param dimensions: Size of the board
+        :param moves: Moves of a piece
+        :param pieces: Coordinates of already placed pieces in the order they were placed
+        :param amount: Amount of pieces that needs to be placed
+        :param filename: Name of the file with all solutions
+        :param options: Options of ChessSolver.compute, that change contents of the file
+        :return: None
+        """
+        if os.path.getsize(filename) > self.max_file_size:
+            return None
+        with open(filename, 'rb') as f:
+            value = zlib.compress(f.read())
+        self.__put(self.__key('file', dimensions, list(moves), list(pieces), amount, *options), value)
+        return None
+
+    def close(self) -> None:
+        """
+        Closes the database
+        :return: None
+        """
+        self.__db.close()
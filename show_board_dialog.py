@@ -1,41 +1,27 @@
-from PySide6.QtWidgets import QPushButton, QDialog, QHBoxLayout, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt, QRunnable, QThreadPool, Slot
-from chess import ChessSolver
-from board_view import PIECE_COLOR, ATTACKED_TILE_COLOR, PIECE_AUTO_COLOR, BoardView
+from PySide6.QtWidgets import QPushButton, QDialog, QHBoxLayout, QVBoxLayout, QLabel, QMessageBox
+from PySide6.QtCore import Qt, QThreadPool
+from board_view import BoardView
+from progress_dialog import ProgressWidget
+from workers import ChessWorker
 
 class ShowBoardWidget(QDialog):
-    def __init__(self, parent):
+    def __init__(self, parent, solution: list[tuple[int, int], ]):
         """
         Initialization of window with board with first solution.
         :param parent: Parent class
+        :param solution: First solution, found by parent
         """
         super().__init__(parent)
         self.setWindowTitle("Show Board")
         self.parent = parent
         self.size = parent.board_size
-        self.chess = ChessSolver(parent.board_size)
         self.amount = parent.amount
-        self.placed_pieces = self.parent.placed_pieces.copy()
-        self.tiles_under_attack = self.parent.tiles_under_attack.copy()
+        self.model = parent.model
 
         self.board_view = BoardView(parent.board_size, lambda x, y: None)
-        self.tiles = self.board_view.get_board()
-
-        self.chess.place_pieces(self.placed_pieces)
-        solution = self.chess.compute(self.amount, 1)
-        auto_pieces = list(filter(lambda piece: piece not in self.placed_pieces, solution))
-        c1 = ChessSolver(self.size)
-        for i in auto_pieces:
-            moves = c1.place_piece(i[0], i[1])
-            self.tiles[i[0]][i[1]].setBrush(PIECE_AUTO_COLOR)
-            for j in moves:
-                self.tiles[j[0]][j[1]].setBrush(ATTACKED_TILE_COLOR)
-
-        for i in self.placed_pieces:
-            moves = c1.place_piece(i[0], i[1])
-            self.tiles[i[0]][i[1]].setBrush(PIECE_COLOR)
-            for j in moves:
-                self.tiles[j[0]][j[1]].setBrush(ATTACKED_TILE_COLOR)
+        self.model.show_solution(solution)
+        self.board_view.set_states(self.model.squares()) # whole solution is one update
+        self.model.subscribe(self.board_view.set_states)
 
         # compute and write to file button
         self.write_bt = QPushButton("Write to File")
@@ -61,34 +47,18 @@ class ShowBoardWidget(QDialog):
 
     def write_bt_clicked(self):
         """
-        Called upon user clicking write button.
+        Called upon user clicking write button. Writes all solutions to the file in other thread,
+        while window with progress is shown.
         :return: None
         """
-        worker = ChessWorker(self.parent.board_size, self.placed_pieces, self.amount)
+        worker = ChessWorker(self.model.chess, self.amount)
+        progress = ProgressWidget(self, worker, "Writing to the File")
         self.threadpool.start(worker)
-
-class ChessWorker(QRunnable):
-    def __init__(self, dimensions, placed_pieces, amount):
-        """
-        Initializing worker class, method of which will be executed in other thread.
-        :param dimensions: Size of a board
-        :param placed_pieces: List of placed pieces on a board
-        :param amount: Amount of pieces, that need to be placed
-        """
-        super().__init__()
-        self.chess = ChessSolver(dimensions)
-        for i in placed_pieces:
-            self.chess.place_piece(i[0], i[1])
-        self.amount = amount
-
-    @Slot()
-    def run(self):
-        """
-        Called in another thread. Writing chess solutions in a file.
-        :return: None
-        """
-        self.chess.compute(self.amount)
-        dlg = QDialog()
+        if progress.exec() != QDialog.DialogCode.Accepted: # cancelled by user or failed
+            if progress.error is not None:
+                QMessageBox.critical(self, "Error", progress.error)
+            return None
+        dlg = QDialog(self)
         dlg.setFixedSize(300, 70)
         lb = QLabel("Writing to the file is completed")
         lb.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -99,4 +69,14 @@ class ChessWorker(QRunnable):
         layout.addWidget(bt1)
         dlg.setLayout(layout)
         dlg.exec()
+        return None
 
+    def done(self, result):
+        """
+        Called, when the window is closed. Pieces of the solution are hidden.
+        :param result: Result code of the dialog
+        :return: None
+        """
+        self.model.unsubscribe(self.board_view.set_states)
+        self.model.clear_solution()
+        super().done(result)
@@ -0,0 +1,194 @@
+import mmap
+import re
+import struct
+import sys
+from array import array
+from sparse_board import board_shape
+
+MAGIC = b'CHSL'
+VERSION = 1
+# magic, version, bytes per square, byte order (0 - little, 1 - big), dimensions, amount of pieces placed by solver,
+# amount of moves, amount of already placed pieces
+HEADER = struct.Struct('<4sBBBxIIII')
+MOVE = struct.Struct('<ii')
+PIECE = struct.Struct('<II')
+TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+BUFFER_SIZE = 1 << 16 # amount of squares, that are written at once
+
+def square_width(dimensions: int) -> int:
+    """
+    :param dimensions: Size of the board
+    :return: Amount of bytes, that is enough to store number of any square of the board
+    """
+    for width in TYPECODES:
+        if dimensions * dimensions <= 1 << 8 * width:
+            return width
+    raise ValueError("Board is too large for binary format")
+
+def write_binary(f, dimensions, amount: int, moves: tuple[tuple[int, int], ...], pieces: list[tuple[int, int], ],
+                 solutions) -> int:
+    """
+    Writes header and solutions to the binary file. Every solution is written as amount numbers of squares
+    (x * dimensions + y) of pieces placed by solver, already placed pieces are written only once in the header.
+    :param f: File opened for writing in binary mode
+    :param dimensions: Size of the board or tuple (rows, columns) with equal amounts
+    :param amount: Amount of pieces placed by solver
+    :param moves: Moves of a piece
+    :param pieces: Coordinates of already placed pieces
+    :param solutions: Iterable of tuples with coordinates of already placed pieces followed by placed ones
+    :return: Amount of written solutions
+    """
+    rows, dimensions = board_shape(dimensions)
+    if rows != dimensions:
+        raise ValueError("Binary format needs a square board")
+    width = square_width(dimensions)
+    header = HEADER.pack(MAGIC, VERSION, width, sys.byteorder == 'big', dimensions, amount, len(moves), len(pieces))
+    header += b"".join(MOVE.pack(dx, dy) for dx, dy in moves)
+    header += b"".join(PIECE.pack(x, y) for x, y in pieces)
+    f.write(header + bytes(-len(header) % 8)) # records start at aligned offset
+    skip = len(pieces)
+    buffer = array(TYPECODES[width])
+    written = 0
+    for solution in solutions:
+        for x, y in solution[skip:]:
+            buffer.append(x * dimensions + y)
+        written += 1
+        if len(buffer) >= BUFFER_SIZE:
+            buffer.tofile(f)
+            del buffer[:]
+    buffer.tofile(f)
+    return written
+
+class SolutionFile:
+    def __init__(self, filename: str):
+        """
+        Initializing class that memory-maps binary file with solutions.
+        Solutions are read straight from the mapped file without copying it.
+        :param filename: Name of the binary file
+        """
+        self.__file = open(filename, 'rb')
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, big_endian, self.dimensions, self.amount, moves, pieces = HEADER.unpack_from(self.__map)
+        if magic != MAGIC or version != VERSION or big_endian != (sys.byteorder == 'big'):
+            self.__map.close()
+            self.__file.close()
+            raise ValueError(filename + " is not a binary file with solutions written on this machine")
+        offset = HEADER.size
+        self.moves = tuple(MOVE.unpack_from(self.__map, offset + i * MOVE.size) for i in range(moves))
+        offset += moves * MOVE.size
+        self.pieces = tuple(PIECE.unpack_from(self.__map, offset + i * PIECE.size) for i in range(pieces))
+        offset += pieces * PIECE.size
+        offset += -offset % 8
+        self.__view = memoryview(self.__map)
+        self.__squares = self.__view[offset:].cast(TYPECODES[width])
+        self.__coordinates = [divmod(sq, self.dimensions) for sq in range(self.dimensions * self.dimensions)]
+
+    def __len__(self) -> int:
+        """
+        :return: Amount of solutions in the file
+        """
+        if self.amount > self.dimensions * self.dimensions:
+            return 0
+        if self.amount == 0:
+            return 1 # the only solution is already placed pieces
+        return len(self.__squares) // self.amount
+
+    def record(self, index: int) -> memoryview:
+        """
+        :param index: Number of the solution
+        :return: Numbers of squares of pieces placed by solver, view of the mapped file
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Index is out of range!")
+        return self.__squares[index * self.amount:(index + 1) * self.amount]
+
+    def __getitem__(self, index: int) -> tuple[tuple[int, int], ...]:
+        """
+        :param index: Number of the solution
+        :return: Coordinates of already placed pieces followed by placed ones, as ChessSolver.iter_solutions yields
+        """
+        coordinates = self.__coordinates
+        return self.pieces + tuple([coordinates[sq] for sq in self.record(index)])
+
+    def __iter__(self):
+        """
+        :return: Generator of tuples with coordinates of pieces
+        """
+        if self.amount == 0:
+            yield from (self.pieces for _ in range(len(self)))
+            return
+        coordinates = self.__coordinates
+        squares = self.__squares
+        for start in range(0, len(self) * self.amount, self.amount):
+            yield self.pieces + tuple([coordinates[sq] for sq in squares[start:start + self.amount]])
+
+    def close(self) -> None:
+        """
+        Releases mapped file
+        :return: None
+        """
+        self.__squares.release()
+        self.__view.release()
+        self.__map.close()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+def text_to_binary(text_file: str, binary_file: str, dimensions: int, moves: tuple[tuple[int, int], ...],
+                   pieces: list[tuple[int, int], ], amount: int | None = None) -> int:
+    """
+    Converts text file written by ChessSolver.compute into binary file
+    :param text_file: Name of the text file
+    :param binary_file: Name of the binary file
+    :param dimensions: Size of the board
+    :param moves: Moves of a piece
+    :param pieces: Coordinates of already placed pieces, they go first in every line
+    :param amount: Amount of pieces placed by solver. if None, it is taken from the first line
+    :return: Amount of converted solutions
+    """
+    number = re.compile(r'-?\d+')
+
+    def solutions(f):
+        for line in f:
+            numbers = list(map(int, number.findall(line)))
+            yield tuple(zip(numbers[::2], numbers[1::2]))
+
+    with open(text_file, 'r') as f:
+        first = f.readline()
+        if first.startswith('no solutions'):
+            lines = []
+            if amount is None:
+                amount = dimensions * dimensions + 1
+        else:
+            f.seek(0)
+            lines = solutions(f)
+            if amount is None:
+                if not first:
+                    raise ValueError("amount of pieces can not be taken from empty file " + text_file)
+                amount = len(number.findall(first)) // 2 - len(pieces)
+        with open(binary_file, 'wb') as out:
+            return write_binary(out, dimensions, amount, moves, pieces, lines)
+
+def binary_to_text(binary_file: str, text_file: str) -> int:
+    """
+    Converts binary file into text file in the same format, as ChessSolver.compute writes
+    :param binary_file: Name of the binary file
+    :param text_file: Name of the text file
+    :return: Amount of converted solutions
+    """
+    with SolutionFile(binary_file) as solutions, open(text_file, 'w') as f:
+        if solutions.amount > solutions.dimensions * solutions.dimensions:
+            f.write('no solutions')
+            return 0
+        n = solutions.dimensions
+        labels = [str(divmod(sq, n)) + " " for sq in range(n * n)]
+        prefix = "".join(str(piece) + " " for piece in solutions.pieces)
+        for i in range(len(solutions)):
+            f.write(prefix + "".join([labels[sq] for sq in solutions.record(i)]) + '\n')
+        return len(solutions)
@@ -0,0 +1,90 @@
+# boards with more squares are sparse, when the kind of the board is not chosen.
+# Every BitBoard mask is as wide as the board, so masks of all squares take squares ** 2 bits, 1.4 GB for 256x256
+SPARSE_SQUARES = 1 << 16
+
+def board_shape(dimensions) -> tuple[int, int]:
+    """
+    :param dimensions: Size of the square board or tuple (rows, columns) of the rectangular one
+    :return: Tuple with amounts of rows and columns
+    """
+    if isinstance(dimensions, int):
+        return dimensions, dimensions
+    rows, columns = dimensions
+    return int(rows), int(columns)
+
+def _index(index: int, size: int) -> int:
+    """
+    :param index: Index of row or column, negative ones count from the end as in list
+    :param size: Amount of rows or columns
+    :return: Index from 0 to size - 1, raises IndexError if it is out of range
+    """
+    if index < 0:
+        index += size
+    if not 0 <= index < size:
+        raise IndexError("Index is out of range!")
+    return index
+
+class _SparseRow:
+    def __init__(self, board, x: int):
+        """
+        Initializing view of one row of the sparse board
+        :param board: Instance of SparseBoard
+        :param x: X coordinate of the row
+        """
+        self.__values = board.values
+        self.__columns = board.columns
+        self.__start = x * board.columns
+
+    def __len__(self) -> int:
+        return self.__columns
+
+    def __getitem__(self, y: int) -> int:
+        return self.__values.get(self.__start + _index(y, self.__columns), 0)
+
+    def __setitem__(self, y: int, value: int) -> None:
+        key = self.__start + _index(y, self.__columns)
+        if value:
+            self.__values[key] = value
+        else:
+            self.__values.pop(key, None) # free squares are not stored
+
+    def __iter__(self):
+        get = self.__values.get
+        return (get(key, 0) for key in range(self.__start, self.__start + self.__columns))
+
+class SparseBoard:
+    def __init__(self, rows: int, columns: int):
+        """
+        Initializing class that stores only occupied and attacked squares in dictionary keyed by x * columns + y.
+        Values have the same meaning as in two-dimensional list and are read and written the same way: board[x][y],
+        so memory does not depend on the size of the board
+        :param rows: Amount of rows
+        :param columns: Amount of columns
+        """
+        self.rows = rows
+        self.columns = columns
+        self.values = {} # x * columns + y: value of the square, that is not 0
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, x: int) -> _SparseRow:
+        return _SparseRow(self, _index(x, self.rows))
+
+    def __iter__(self):
+        return (_SparseRow(self, x) for x in range(self.rows))
+
+    def squares(self):
+        """
+        :return: Generator of tuples (x, y, value) of squares, that are not 0, in row-major order
+        """
+        for key in sorted(self.values):
+            x, y = divmod(key, self.columns)
+            yield x, y, self.values[key]
+
+def is_sparse_board(board) -> bool:
+    """
+    :param board: Two-dimensional list, array or SparseBoard
+    :return: True if board is SparseBoard
+    """
+    return isinstance(board, SparseBoard)
@@ -0,0 +1,62 @@
+import time
+
+HOOK_NODES = 1 << 14 # default amount of visited squares between two calls of the hook
+
+class SearchStats:
+    def __init__(self, hook=None, every: int = HOOK_NODES):
+        """
+        Initializing class that collects statistics of the search. Searches fill it only when it is given to them,
+        the search without statistics runs separate code, that does not count anything.
+        :param hook: Function, that is called with this instance every `every` visited squares
+        and when the search is over. It can stop the search by raising an exception
+        :param every: Amount of visited squares between two calls of the hook
+        """
+        self.hook = hook
+        self.every = every
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clears statistics and starts the clock
+        :return: None
+        """
+        self.nodes = [] # nodes[d] - amount of squares, on which the piece number d was tried
+        self.visited = 0 # sum of nodes
+        self.backtracks = 0 # amount of times the search took back a placed piece, that was not the last one
+        self.prunes = 0 # amount of branches cut, because the squares left can not hold the pieces left
+        self.leaves = 0 # amount of found solutions
+        self.first_solution_seconds = None
+        self.write_seconds = 0.0 # time spent in writing to the output file
+        self.started = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """
+        :return: Seconds since the last reset
+        """
+        return time.perf_counter() - self.started
+
+    def report(self, progress=None) -> None:
+        """
+        Called by the search after it updated the counters. Calls the hook and progress
+        :param progress: Function, that is called with amounts of visited squares and found solutions
+        :return: None
+        """
+        if self.hook is not None:
+            self.hook(self)
+        if progress is not None:
+            progress(self.visited, self.leaves)
+
+    def as_dict(self) -> dict:
+        """
+        :return: Statistics as dictionary, that can be saved as JSON
+        """
+        return {
+            'nodes': list(self.nodes),
+            'visited': self.visited,
+            'backtracks': self.backtracks,
+            'prunes': self.prunes,
+            'leaves': self.leaves,
+            'first_solution_seconds': self.first_solution_seconds,
+            'write_seconds': self.write_seconds,
+            'elapsed_seconds': self.elapsed()
+        }
@@ -0,0 +1,116 @@
+from bitboard import BitBoard
+
+# rotations and reflections of the board: (x, y, rows, columns) -> (x, y)
+TRANSFORMATIONS = (
+    lambda x, y, r, c: (x, y),
+    lambda x, y, r, c: (y, r - 1 - x),
+    lambda x, y, r, c: (r - 1 - x, c - 1 - y),
+    lambda x, y, r, c: (c - 1 - y, x),
+    lambda x, y, r, c: (r - 1 - x, y),
+    lambda x, y, r, c: (x, c - 1 - y),
+    lambda x, y, r, c: (y, x),
+    lambda x, y, r, c: (c - 1 - y, r - 1 - x),
+)
+
+def transformations(rows: int, columns: int) -> list:
+    """
+    :param rows: Amount of rows
+    :param columns: Amount of columns
+    :return: Transformations, that map the board onto itself. Rectangular board can not be rotated by 90 degrees
+    or reflected in diagonals, which swap rows and columns
+    """
+    return [transform for transform in TRANSFORMATIONS
+            if rows == columns or transform(1, 0, rows, columns)[1] == transform(0, 0, rows, columns)[1]]
+
+class Symmetry:
+    def __init__(self, bitboard: BitBoard, moves: tuple[tuple[int, int], ...], free: int):
+        """
+        Initializing class that finds rotations and reflections, which map every solution to another solution,
+        and enumerates one solution of every group of symmetric ones.
+        :param bitboard: Instance of BitBoard
+        :param moves: Moves of a piece
+        :param free: Mask of free squares
+        """
+        self.bitboard = bitboard
+        rows, n = bitboard.rows, bitboard.columns
+        # two pieces attack each other, if the later one stands on the square attacked by the earlier one
+        forward = {(dx, dy) for dx, dy in moves if (dx, dy) > (0, 0)}
+        attacks = forward | {(-dx, -dy) for dx, dy in forward}
+        self.permutations = [] # permutations[g][sq] - square, where transformation g moves square sq
+        for transform in transformations(rows, n):
+            x0, y0 = transform(0, 0, rows, n)
+            moved = set()
+            for dx, dy in attacks:
+                x, y = transform(dx, dy, rows, n)
+                moved.add((x - x0, y - y0))
+            if moved != attacks:
+                continue
+            permutation = [bitboard.square(*transform(x, y, rows, n)) for x in range(rows) for y in range(n)]
+            if sum(1 << permutation[sq] for sq in range(rows * n) if free >> sq & 1) == free:
+                self.permutations.append(permutation)
+        self.images = [[1 << sq for sq in permutation] for permutation in self.permutations[1:]]
+        # the first piece of the smallest solution is not greater than any image of other pieces
+        self.allowed = []
+        for first in range(rows * n):
+            self.allowed.append(sum(1 << sq for sq in range(rows * n)
+                                    if min(permutation[sq] for permutation in self.permutations) >= first))
+
+    def orbit(self, solution: tuple[int, ...]) -> list[tuple[int, ...]]:
+        """
+        :param solution: Increasing numbers of squares of placed pieces
+        :return: Sorted list of all different images of the solution
+        """
+        return sorted({tuple(sorted([permutation[sq] for sq in solution])) for permutation in self.permutations})
+
+    def solutions(self, free: int, amount: int):
+        """
+        Yields one solution of every group of symmetric solutions, the lexicographically smallest one.
+        Search keeps images of placed pieces under every transformation and cuts a branch as soon as some image
+        is already known to be smaller: the smallest square, where placed pieces and their image differ, is occupied
+        in the image, and squares following the last placed piece can not change that.
+        :param free: Mask of free squares
+        :param amount: Amount of pieces that needs to be placed
+        :return: Generator of tuples with numbers of squares of placed pieces
+        """
+        if amount == 0:
+            yield ()
+            return
+        keep = self.bitboard.keep
+        capacity = self.bitboard.capacity
+        images = self.images
+        placed = []
+        stack = [(free, 0, (0,) * len(images))] # available squares, mask of placed pieces, masks of their images
+        while stack:
+            avail, pieces, imaged = stack[-1]
+            if not avail:
+                stack.pop()
+                if placed:
+                    placed.pop()
+                continue
+            low = avail & -avail
+            avail ^= low
+            stack[-1] = (avail, pieces, imaged)
+            sq = low.bit_length() - 1
+            left = amount - len(stack)
+            last = not left
+            if not last:
+                following = avail & keep[sq]
+                if len(stack) == 1:
+                    following &= self.allowed[sq]
+                if following.bit_count() < left or left > 1 and capacity(following) < left:
+                    continue
+            pieces |= low
+            below = (low << 1) - 1 # squares not greater than sq, no other piece will be placed there
+            new_imaged = []
+            for image, mapped in zip(images, imaged):
+                mapped |= image[sq]
+                diff = pieces ^ (mapped if last else mapped & below)
+                if diff & -diff & mapped:
+                    break
+                new_imaged.append(mapped)
+            else:
+                if last:
+                    yield (*placed, sq)
+                else:
+                    placed.append(sq)
+                    stack.append((following, pieces, tuple(new_imaged)))
@@ -0,0 +1,99 @@
+from itertools import combinations
+import pytest
+from chess import ChessSolver
+
+PLACEMENTS = ([], [(1, 1)], [(0, 0), (4, 4)])
+ASYMMETRIC_MOVES = ((1, 0), (0, 2), (2, 1))
+
+def brute_force(chess: ChessSolver, amount: int) -> list[tuple]:
+    """
+    Finds solutions by checking every combination of free squares. As in the search, a piece must not stand
+    on a square attacked by pieces before it, but it can attack them, when moves are asymmetric
+    :param chess: Instance of ChessSolver with placed pieces
+    :param amount: Amount of pieces that needs to be placed
+    :return: List of tuples with coordinates of already placed pieces followed by placed ones
+    """
+    size = len(chess.board)
+    free = [(x, y) for x in range(size) for y in range(size) if chess.board[x][y] == 0 and (x, y) not in chess.pieces]
+    return [tuple(chess.pieces) + placement for placement in combinations(free, amount)
+            if all((b[0] - a[0], b[1] - a[1]) not in chess._moves for a, b in combinations(placement, 2))]
+
+def create_solver(dimensions: int, pieces: list[tuple[int, int], ], output_file: str = 'output.txt',
+                  **options) -> ChessSolver:
+    """
+    :return: Instance of ChessSolver with pieces, that fit on the board, placed
+    """
+    chess = ChessSolver(dimensions, output_file, **options)
+    for x, y in pieces:
+        if x < dimensions and y < dimensions:
+            chess.place_piece(x, y)
+    return chess
+
+@pytest.mark.parametrize('pieces', PLACEMENTS)
+@pytest.mark.parametrize('amount', range(0, 7))
+@pytest.mark.parametrize('dimensions', range(1, 6))
+@pytest.mark.parametrize('engine', ('list', 'bitboard'))
+def test_iter_solutions(engine, dimensions, amount, pieces):
+    chess = create_solver(dimensions, pieces)
+    assert list(chess.iter_solutions(amount, engine=engine)) == brute_force(chess, amount)
+
+# (0, 1) attacks the piece on (1, 1), so the square of that piece is 0 on the board
+@pytest.mark.parametrize('pieces', ([(1, 1)], [(1, 1), (0, 1)], [(2, 0), (0, 0)]))
+@pytest.mark.parametrize('amount', range(0, 5))
+@pytest.mark.parametrize('engine', ('list', 'bitboard'))
+def test_asymmetric_moves(engine, amount, pieces):
+    chess = create_solver(3, pieces, _moves=ASYMMETRIC_MOVES)
+    assert list(chess.iter_solutions(amount, engine=engine)) == brute_force(chess, amount)
+
+@pytest.mark.parametrize('pieces', PLACEMENTS)
+@pytest.mark.parametrize('amount', range(0, 7))
+@pytest.mark.parametrize('dimensions', range(1, 6))
+def test_sparse_solutions(dimensions, amount, pieces):
+    chess = create_solver(dimensions, pieces, sparse=True)
+    expected = brute_force(chess, amount)
+    assert list(chess.iter_solutions(amount)) == expected
+    assert chess.count(amount) == len(expected)
+
+def test_sparse_many_pieces():
+    chess = ChessSolver(300, sparse=True)
+    solution = chess.first_solutions(1500)[0]
+    squares = set(solution)
+    assert len(squares) == 1500
+    assert not any((x + dx, y + dy) in squares for x, y in solution for dx, dy in chess._moves)
+    assert not chess.board.values # the board is restored after the search
+
+@pytest.mark.parametrize('pieces', PLACEMENTS)
+@pytest.mark.parametrize('amount', (1, 3, 4))
+@pytest.mark.parametrize('engine', ('list', 'bitboard'))
+def test_compute(tmp_path, engine, amount, pieces):
+    chess = create_solver(5, pieces, str(tmp_path / 'output.txt'))
+    expected = brute_force(chess, amount)
+    chess.compute(amount, engine=engine)
+    with open(chess.output_file, 'r') as f:
+        lines = f.read().splitlines()
+    assert lines == ["".join(str(square) + " " for square in solution) for solution in expected]
+
+def test_compute_no_room(tmp_path):
+    chess = ChessSolver(2, str(tmp_path / 'output.txt'))
+    chess.compute(5)
+    with open(chess.output_file, 'r') as f:
+        assert f.read() == 'no solutions'
+
+def test_binary_rectangle_keeps_file(tmp_path):
+    chess = ChessSolver((3, 4), str(tmp_path / 'output.bin'))
+    with open(chess.output_file, 'w') as f:
+        f.write('kept')
+    with pytest.raises(ValueError):
+        chess.compute(2, file_format='binary')
+    with open(chess.output_file, 'r') as f:
+        assert f.read() == 'kept'
+
+@pytest.mark.parametrize('amount', (1, 2, 3))
+def test_non_attacking(amount):
+    pytest.importorskip('numpy')
+    chess = create_solver(4, [(1, 1)])
+    squares = [(x, y) for x in range(4) for y in range(4)]
+    candidates = list(combinations(squares, amount))
+    expected = set(brute_force(chess, amount))
+    result = chess.non_attacking(candidates)
+    assert [tuple(chess.pieces) + candidate in expected for candidate in candidates] == result.tolist()
@@ -0,0 +1,156 @@
+import argparse
+import re
+import sys
+from numpy_board import np, require_numpy
+from chess import DEFAULT_MOVES, read_input
+from writer import open_solutions
+from sparse_board import board_shape
+
+CHUNK_SIZE = 1 << 22 # amount of bytes, that are read and parsed at once
+PAIRS_LIMIT = 1 << 22 # amount of pairs of pieces, that are compared at once
+PUNCTUATION = bytes.maketrans(b'(),', b'   ')
+
+class SolutionValidator:
+    def __init__(self, dimensions, amount: int, pieces: list[tuple[int, int], ],
+                 moves: tuple[tuple[int, int], ...] = DEFAULT_MOVES):
+        """
+        Initializing class that checks files with solutions written by ChessSolver.compute.
+        Every line must have amount pieces besides already placed ones, include all already placed pieces,
+        keep pieces inside the board on different squares, and no piece may stand on a square attacked
+        by a piece written before it, as no piece can be placed on attacked square.
+        :param dimensions: Size of the board or tuple (rows, columns) of the rectangular board
+        :param amount: Amount of pieces placed by solver
+        :param pieces: Coordinates of already placed pieces
+        :param moves: Moves of a piece
+        """
+        require_numpy()
+        self.dimensions = dimensions
+        self.rows, self.columns = rows, columns = board_shape(dimensions)
+        self.amount = amount
+        self.pieces = [tuple(piece) for piece in pieces]
+        self.size = amount + len(self.pieces) # pieces in every line
+        side = 2 * columns - 1
+        # attacks[(dx + rows - 1) * side + dy + columns - 1] - True if a piece attacks square moved by dx, dy
+        self.attacks = np.zeros((2 * rows - 1) * side, dtype=bool)
+        for dx, dy in moves:
+            if abs(dx) < rows and abs(dy) < columns:
+                self.attacks[(dx + rows - 1) * side + dy + columns - 1] = True
+        self.__earlier, self.__later = np.triu_indices(self.size, 1) # every pair of pieces, earlier one first
+
+    def __check(self, squares):
+        """
+        Checks parsed lines with the right amount of pieces
+        :param squares: Array of shape (lines, pieces, 2)
+        :return: Array with reason for every invalid line, None for valid ones
+        """
+        rows, n = self.rows, self.columns
+        reasons = np.full(len(squares), None, dtype=object)
+        outside = ((squares < 0) | (squares >= (rows, n))).any(axis=(1, 2))
+        x = np.clip(squares[..., 0], 0, rows - 1)
+        y = np.clip(squares[..., 1], 0, n - 1)
+        numbers = x * n + y
+        missing = np.zeros(len(squares), dtype=bool)
+        for px, py in self.pieces:
+            missing |= ~(numbers == px * n + py).any(axis=1)
+        batch = max(1, PAIRS_LIMIT // max(1, len(self.__earlier)))
+        side = 2 * n - 1
+        repeated = np.zeros(len(squares), dtype=bool)
+        attacked = np.zeros(len(squares), dtype=bool)
+        for start in range(0, len(squares), batch):
+            bx, by = x[start:start + batch], y[start:start + batch]
+            dx = bx[:, self.__later] - bx[:, self.__earlier] # [line, pair] - move from earlier piece to later one
+            dy = by[:, self.__later] - by[:, self.__earlier]
+            repeated[start:start + batch] = ((dx == 0) & (dy == 0)).any(axis=1)
+            attacked[start:start + batch] = self.attacks[(dx + rows - 1) * side + dy + n - 1].any(axis=1)
+        # the first problem found is reported
+        reasons[attacked] = "piece stands on attacked square"
+        reasons[repeated] = "two pieces on one square"
+        reasons[missing] = "already placed piece is missing"
+        reasons[outside] = "piece is outside of the board"
+        return reasons
+
+    def __parse(self, data: bytes):
+        """
+        Parses and checks lines of one chunk
+        :param data: Whole lines, the last one ends with line break
+        :return: Array with reason for every invalid line, None for valid ones
+        """
+        raw = np.frombuffer(data, dtype=np.uint8)
+        ends = np.flatnonzero(raw == ord('\n'))
+        counts = np.diff(np.searchsorted(np.flatnonzero(raw == ord('(')), ends), prepend=0)
+        right = counts == self.size
+        reasons = np.full(len(ends), None, dtype=object)
+        try:
+            numbers = np.fromstring(data.translate(PUNCTUATION).decode('latin-1'), dtype=np.int64, sep=' ')
+        except ValueError:
+            numbers = None
+        if numbers is None or len(numbers) != 2 * counts.sum():
+            # some line is not made of coordinates, lines are parsed one by one
+            lines = data.split(b'\n')[:-1]
+            for i, line in enumerate(lines):
+                if re.fullmatch(rb'(\(-?\d+, -?\d+\) )*', line) is None:
+                    reasons[i] = "line is not a list of coordinates"
+                    right[i] = False
+            text = b" ".join(line for line, ok in zip(lines, right) if ok).translate(PUNCTUATION).decode('latin-1')
+            numbers = np.fromstring(text, dtype=np.int64, sep=' ') if text.strip() else np.zeros(0, dtype=np.int64)
+        else:
+            numbers = numbers[np.repeat(right, 2 * counts)]
+        for i in np.flatnonzero(~right):
+            if reasons[i] is None:
+                reasons[i] = f"{counts[i]} pieces instead of {self.size}"
+        reasons[right] = self.__check(numbers.reshape(int(right.sum()), self.size, 2))
+        return reasons
+
+    def validate(self, filename: str, max_errors: int = 10, chunk_size: int = CHUNK_SIZE) -> tuple[int, list]:
+        """
+        Reads the file in chunks of whole lines and checks every chunk at once. gzip and lzma files are uncompressed
+        :param filename: Name of the file with solutions
+        :param max_errors: Amount of invalid lines, after which checking stops
+        :param chunk_size: Amount of bytes, that are read at once
+        :return: Amount of checked lines and list of (number of the line starting from 1, reason) of invalid lines
+        """
+        errors = []
+        checked = 0
+        with open_solutions(filename) as f:
+            head = f.read(len(b'no solutions'))
+            if head == b'no solutions':
+                if self.amount <= self.rows * self.columns:
+                    errors.append((1, "'no solutions' is written, though pieces fit on the board"))
+                return 1, errors
+            rest = head
+            while len(errors) < max_errors:
+                chunk = f.read(chunk_size)
+                data = rest + chunk
+                end = data.rfind(b'\n') + 1
+                data, rest = data[:end], data[end:]
+                if data:
+                    reasons = self.__parse(data)
+                    for i in np.flatnonzero(np.not_equal(reasons, None))[:max_errors - len(errors)]:
+                        errors.append((checked + int(i) + 1, reasons[i]))
+                    checked += len(reasons)
+                if not chunk:
+                    if rest and len(errors) < max_errors: # last line without line break
+                        errors.append((checked + 1, "line is not finished"))
+                    break
+        return checked, errors
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Command-line entry point
+    :param argv: Arguments without name of the program. None - sys.argv is used
+    :return: Exit code, 1 if invalid lines were found
+    """
+    parser = argparse.ArgumentParser(description="Checks file with solutions of the problem from input file")
+    parser.add_argument('output', nargs='?', default='output.txt')
+    parser.add_argument('input', nargs='?', default='input.txt')
+    parser.add_argument('--max-errors', type=int, default=10)
+    args = parser.parse_args(argv)
+    dimensions, amount, pieces = read_input(args.input)
+    checked, errors = SolutionValidator(dimensions, amount, pieces).validate(args.output, args.max_errors)
+    for line, reason in errors:
+        print(f"line {line}: {reason}")
+    print(f"{checked} lines checked, {len(errors)} invalid")
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+from chess import ChessSolver
+import time
+
+class SearchCancelled(Exception):
+    """
+    Raised from progress function of the solver, when user cancels the search
+    """
+
+class WorkerSignals(QObject):
+    """
+    Signals of workers. QRunnable is not QObject, so it can not have signals itself.
+    progress - amount of visited squares, amount of found solutions, elapsed seconds
+    finished - result of ChessSolver.compute
+    cancelled - search was stopped by user
+    failed - search raised an error, its text
+    """
+    progress = Signal(int, int, float)
+    finished = Signal(object)
+    cancelled = Signal()
+    failed = Signal(str)
+
+class SolveWorker(QRunnable):
+    def __init__(self, chess: ChessSolver, amount: int, end: int = 1):
+        """
+        Initializing worker class, that solves chess in other thread and reports through signals.
+        :param chess: Instance of ChessSolver with placed pieces
+        :param amount: Amount of pieces, that need to be placed
+        :param end: if not -1 then first solution is searched, otherwise all solutions are written to the file
+        """
+        super().__init__()
+        self.chess = chess
+        self.amount = amount
+        self.end = end
+        self.signals = WorkerSignals()
+        self.__cancelled = False
+        self.__start = 0.0
+
+    def cancel(self) -> None:
+        """
+        Called from GUI thread. Search stops on the next progress report.
+        :return: None
+        """
+        self.__cancelled = True
+
+    def __progress(self, nodes: int, solutions: int) -> None:
+        """
+        Called by solver in worker thread.
+        :param nodes: Amount of visited squares
+        :param solutions: Amount of found solutions
+        :return: None
+        """
+        if self.__cancelled:
+            raise SearchCancelled()
+        self.signals.progress.emit(nodes, solutions, time.monotonic() - self.__start)
+
+    @Slot()
+    def run(self):
+        """
+        Called in another thread. Solves chess and emits finished, cancelled or failed signal.
+        Errors are only sent to the window, raised in the thread pool they would be printed and lost
+        :return: None
+        """
+        self.__start = time.monotonic()
+        try:
+            result = self.chess.compute(self.amount, self.end, engine='bitboard', progress=self.__progress)
+        except SearchCancelled:
+            self.signals.cancelled.emit()
+            return None
+        except Exception as error: # the window waiting for the worker shows the error
+            self.signals.failed.emit(f"{type(error).__name__}: {error}")
+            return None
+        self.signals.finished.emit(result)
+        return None
+
+class ChessWorker(SolveWorker):
+    def __init__(self, chess: ChessSolver, amount: int):
+        """
+        Initializing worker class, that writes all solutions to the file in other thread.
+        :param chess: Instance of ChessSolver with placed pieces
+        :param amount: Amount of pieces, that need to be placed
+        """
+        super().__init__(chess, amount, -1)
@@ -0,0 +1,155 @@
+import gzip
+import lzma
+import queue
+import threading
+
+COMPRESSIONS = ('none', 'gzip', 'lzma')
+BATCH_SIZE = 1 << 12 # amount of solutions, that are formatted and written at once
+QUEUE_BATCHES = 8 # amount of batches waiting for the writer, the search waits, when there are more
+# lines of solutions repeat a lot, so fast levels compress almost as well as the slowest ones
+GZIP_LEVEL = 1
+LZMA_PRESET = 1
+
+class _Labels(dict):
+    """
+    Text of coordinates in the output file, formatted once for every square
+    """
+    def __missing__(self, key: tuple[int, int]) -> str:
+        self[key] = label = str(key) + " "
+        return label
+
+def open_text(filename: str, compression: str = 'none'):
+    """
+    Opens text file for writing
+    :param filename: Name of the file
+    :param compression: 'none', 'gzip' or 'lzma'
+    :return: Opened text file, that compresses written text
+    """
+    if compression == 'gzip':
+        return gzip.open(filename, 'wt', compresslevel=GZIP_LEVEL)
+    if compression == 'lzma':
+        return lzma.open(filename, 'wt', preset=LZMA_PRESET)
+    if compression != 'none':
+        raise ValueError("Unknown compression: " + str(compression))
+    return open(filename, 'w')
+
+def open_solutions(filename: str):
+    """
+    Opens written file for reading, compression is found by the first bytes of the file
+    :param filename: Name of the file
+    :return: Opened binary file, that returns uncompressed bytes
+    """
+    with open(filename, 'rb') as f:
+        magic = f.read(6)
+    if magic.startswith(b'\x1f\x8b'):
+        return gzip.open(filename, 'rb')
+    if magic == b'\xfd7zXZ\x00':
+        return lzma.open(filename, 'rb')
+    return open(filename, 'rb')
+
+class SolutionWriter:
+    def __init__(self, f, batch_size: int = BATCH_SIZE, queue_batches: int = QUEUE_BATCHES):
+        """
+        Initializing class that formats and writes solutions in a separate thread. The search puts solutions
+        into batches, and full batches go to the bounded queue. When the queue is full, the search waits
+        for the writer, so memory does not grow, when the file is slower than the search.
+        Compressing streams of gzip and lzma release the GIL, so compression runs alongside the search.
+        :param f: Opened text file. It is not closed by the writer
+        :param batch_size: Amount of solutions in one batch
+        :param queue_batches: Maximum amount of batches in the queue
+        """
+        self.__f = f
+        self.batch_size = batch_size
+        self.written = 0 # amount of solutions written to the file
+        self.__batch = []
+        self.__queue = queue.Queue(queue_batches)
+        self.__error = None
+        self.__thread = threading.Thread(target=self.__run, name='solution-writer', daemon=True)
+        self.__thread.start()
+
+    def __run(self) -> None:
+        """
+        Writer thread. After an error batches are only taken out of the queue, so the search never waits forever
+        :return: None
+        """
+        label = _Labels().__getitem__
+        while True:
+            batch = self.__queue.get()
+            if batch is None:
+                return None
+            if self.__error is None:
+                try:
+                    self.__f.write("".join(["".join(map(label, solution)) + '\n' for solution in batch]))
+                    self.written += len(batch)
+                except BaseException as error:
+                    self.__error = error
+            self.__queue.task_done()
+
+    def __send(self) -> None:
+        """
+        Puts the current batch into the queue, waits while the queue is full
+        :return: None
+        """
+        if self.__error is not None:
+            raise self.__error
+        self.__queue.put(self.__batch)
+        self.__batch = []
+
+    def put(self, solution: tuple) -> None:
+        """
+        :param solution: Tuple with coordinates of pieces
+        :return: None
+        """
+        self.__batch.append(solution)
+        if len(self.__batch) >= self.batch_size:
+            self.__send()
+
+    def write(self, solutions) -> None:
+        """
+        :param solutions: Iterable of tuples with coordinates of pieces
+        :return: None
+        """
+        batch_size = self.batch_size
+        for solution in solutions:
+            self.__batch.append(solution)
+            if len(self.__batch) >= batch_size:
+                self.__send()
+
+    def flush(self) -> None:
+        """
+        Waits, until everything put before is passed to the file, so the file can be flushed
+        and its position matches put solutions
+        :return: None
+        """
+        if self.__batch:
+            self.__send()
+        self.__queue.join()
+        if self.__error is not None:
+            raise self.__error
+
+    def close(self) -> None:
+        """
+        Sends the last batch and waits, until everything put before is written. Raises the error of the writer
+        :return: None
+        """
+        if self.__thread.is_alive():
+            if self.__batch:
+                self.__queue.put(self.__batch)
+                self.__batch = []
+            self.__queue.put(None)
+            self.__thread.join()
+        if self.__error is not None:
+            raise self.__error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, traceback) -> None:
+        # solutions found before the search was stopped are still written
+        if error_type is None:
+            self.close()
+        else:
+            try:
+                self.close()
+            except Exception:
+                pass # the error, that stopped the search, is more important